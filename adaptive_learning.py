@@ -3,10 +3,27 @@ Adaptive Learning Engine for The Silent Room
 Tracks comprehension, adjusts difficulty, and creates personalized learning pathways.
 """
 
-from typing import Dict, List, Optional, Tuple, Any, Union
+from typing import Dict, List, Optional, Set, Tuple, Any, Union
+from bisect import bisect_left, bisect_right
 from datetime import datetime, timedelta
+from functools import lru_cache
+from statistics import fmean
 import json
 import math
+import string
+import sys
+
+try:
+    import orjson
+except ImportError:  # Optional C-accelerated encoder; stdlib json is used otherwise
+    orjson = None
+
+# Label ladders for analyze_conversation_for_learning: a score strictly above
+# thresholds[i] earns labels[i + 1], so lookups use bisect_left
+_ENGAGEMENT_THRESHOLDS = (0.4, 0.6)
+_ENGAGEMENT_LABELS = ('low', 'medium', 'high')
+_COMPREHENSION_THRESHOLDS = (0.5, 0.7)
+_COMPREHENSION_LABELS = ('needs_support', 'developing', 'strong')
 
 
 class AdaptiveLearningEngine:
@@ -30,75 +47,236 @@ class AdaptiveLearningEngine:
         'curiosity': ['how', 'why', 'what if', 'can we', 'tell me more', 'interesting', 'cool']
     }
     
+    # Words are whitespace-split (so any script counts) and trimmed of surrounding punctuation.
+    # Keywords are matched against token n-grams: single words as str keys, phrases as tuples.
+    _TOKEN_STRIP = string.punctuation + '\u2018\u2019\u201c\u201d\u2026\u2013\u2014\u00bf\u00a1'
+    _COMP_KEYS = {
+        category: tuple(word if ' ' not in word else tuple(word.split()) for word in words)
+        for category, words in COMPREHENSION_KEYWORDS.items()
+    }
+    _PHRASE_SIZES = tuple(sorted({
+        len(word.split()) for words in COMPREHENSION_KEYWORDS.values() for word in words if ' ' in word
+    }))
+    
+    # Number of recent comprehension/question entries kept for persistence
+    HISTORY_LIMIT = 50
+    
     # Topic categories from your app
-    TOPICS = [
+    # Interned so skill_matrix keys and suggestions share the same string objects
+    TOPICS = tuple(sys.intern(t) for t in (
         'Space', 'Oceans', 'Robots', 'Climate', 'Nature', 'Energy', 'Math',
         'Physics', 'Chemistry', 'Biology', 'Engineering', 'Art', 'Music',
         'Coding', 'History', 'Philosophy', 'Ethics'
-    ]
+    ))
+    _TOPICS_LC = tuple((t, t.lower()) for t in TOPICS)
+    
+    # Prompt building blocks for generate_adaptive_prompt
+    _DIFFICULTY_DESC = {
+        1: "foundational concepts using everyday examples",
+        2: "elementary principles with hands-on connections",
+        3: "intermediate ideas with real-world applications",
+        4: "advanced concepts with critical thinking challenges",
+        5: "expert-level exploration with creative problem-solving"
+    }
+    _GUIDANCE_LOW = """
+            - Use VERY simple language and short sentences
+            - Provide more examples and analogies
+            - Break concepts into tiny steps
+            - Check understanding after each point
+            - Be extra encouraging and patient
+            """
+    _GUIDANCE_MID = """
+            - Use clear, age-appropriate language
+            - Provide examples when needed
+            - Build on what they already understand
+            - Ask guiding questions
+            - Encourage exploration
+            """
+    _GUIDANCE_HIGH = """
+            - Introduce more complex concepts
+            - Challenge with "what if" scenarios
+            - Encourage deeper analysis
+            - Connect multiple concepts
+            - Celebrate their advanced thinking
+            """
+    # Below 0.5 -> low, below 0.7 -> mid, otherwise high (bisect_right)
+    _GUIDANCE_THRESHOLDS = (0.5, 0.7)
+    _GUIDANCE_BY_LEVEL = (_GUIDANCE_LOW, _GUIDANCE_MID, _GUIDANCE_HIGH)
     
     def __init__(self, saved_state: Optional[Union[str, Dict[str, Any]]] = None):
         """Initialize the adaptive learning engine with optional saved state."""
-        self.skill_matrix: Dict[str, Dict[int, float]] = {}  # {topic: {difficulty: performance_score}}
+        self._skill_matrix: Dict[str, List[Optional[float]]] = {}  # {topic: [score per difficulty 1..5, None if unseen]}
+        # Plain lists so callers can slice them (e.g. comprehension_history[-5:]); trimmed to
+        # HISTORY_LIMIT on load and persist
         self.comprehension_history: List[Dict[str, Any]] = []  # Track recent comprehension
         self.question_history: List[Dict[str, Any]] = []  # Track questions asked
+        self._topic_sums: Dict[str, float] = {}  # {topic: sum of difficulty scores}
+        self._topic_counts: Dict[str, int] = {}  # {topic: number of scored difficulties}
+        self._avg_cache: Dict[str, float] = {}  # {topic: average score}, rebuilt when dirty
+        self._avg_dirty = True
+        self._zpd_topics: Dict[str, None] = {}  # Ordered set of topics averaging in the ZPD band
         if saved_state:
             self.load_state(saved_state)
     
     def load_state(self, state: Union[str, Dict[str, Any]]) -> None:
         """Load persisted state from JSON string or dict."""
-        try:
-            data = json.loads(state) if isinstance(state, str) else state
-        except Exception:
+        if isinstance(state, dict):
+            data = state
+        elif isinstance(state, str):
+            try:
+                data = orjson.loads(state) if orjson is not None else json.loads(state)
+            except Exception:
+                return
+        else:
             return
         self.skill_matrix = data.get('skill_matrix', {}) or {}
-        self.comprehension_history = data.get('comprehension_history', []) or []
-        self.question_history = data.get('question_history', []) or []
-        
-    def assess_comprehension(self, response_text: str, context: Dict[str, Any]) -> Dict[str, float]:
+        self.comprehension_history = list(data.get('comprehension_history', []) or [])[-self.HISTORY_LIMIT:]
+        self.question_history = list(data.get('question_history', []) or [])[-self.HISTORY_LIMIT:]
+    
+    @property
+    def skill_matrix(self) -> Dict[str, List[Optional[float]]]:
+        """Per-topic scores as fixed-length lists indexed by difficulty - 1 (None if unseen)."""
+        return self._skill_matrix
+    
+    @skill_matrix.setter
+    def skill_matrix(self, raw: Dict[str, Any]) -> None:
+        """Accept list rows or legacy {difficulty: score} dicts and refresh the aggregates."""
+        self._skill_matrix = self._normalize_skill_matrix(raw or {})
+        self._rebuild_aggregates()
+    
+    @classmethod
+    def _normalize_skill_matrix(cls, raw: Dict[str, Any]) -> Dict[str, List[Optional[float]]]:
+        """Coerce persisted rows (fixed-length lists, or legacy {difficulty: score} dicts) to lists."""
+        matrix: Dict[str, List[Optional[float]]] = {}
+        for topic, row in raw.items():
+            scores: List[Optional[float]] = [None] * cls.EXPERT
+            if isinstance(row, dict):
+                for difficulty, score in row.items():
+                    try:
+                        index = int(difficulty) - 1
+                    except (TypeError, ValueError):
+                        continue
+                    if 0 <= index < cls.EXPERT and score is not None:
+                        scores[index] = float(score)
+            elif isinstance(row, (list, tuple)):
+                for index, score in enumerate(row[:cls.EXPERT]):
+                    if score is not None:
+                        scores[index] = float(score)
+            matrix[sys.intern(str(topic))] = scores
+        return matrix
+    
+    def _rebuild_aggregates(self) -> None:
+        """Recompute per-topic score sums/counts after skill_matrix is replaced wholesale."""
+        self._topic_sums = {}
+        self._topic_counts = {}
+        for topic, row in self.skill_matrix.items():
+            seen = [score for score in row if score is not None]
+            if seen:
+                self._topic_sums[topic] = sum(seen)
+                self._topic_counts[topic] = len(seen)
+        self._avg_dirty = True
+        self._zpd_topics = {
+            t: None for t in self.skill_matrix
+            if self._in_zpd(self._topic_sums[t] / self._topic_counts[t] if t in self._topic_counts else 0.5)
+        }
+    
+    @staticmethod
+    def _in_zpd(avg_score: float) -> bool:
+        """Not too easy, not too hard."""
+        return 0.4 <= avg_score <= 0.7
+    
+    def _topic_averages(self) -> Dict[str, float]:
+        """Per-topic average scores, recomputed only after the skill matrix changes."""
+        if self._avg_dirty:
+            self._avg_cache = {t: self._topic_sums[t] / n for t, n in self._topic_counts.items()}
+            self._avg_dirty = False
+        return self._avg_cache
+        
+    def assess_comprehension(
+        self,
+        response_text: str,
+        context: Dict[str, Any],
+        now_iso: Optional[str] = None
+    ) -> Dict[str, float]:
         """
         Analyze a child's response to assess comprehension level.
         
         Args:
             response_text: The child's response
             context: Additional context (time_taken, length, etc.)
+            now_iso: Pre-formatted timestamp to reuse when scoring a batch of responses
             
         Returns:
             Dict with comprehension_score (0-1), curiosity_score (0-1), confidence_score (0-1)
         """
-        response_lower = response_text.lower()
-        word_count = len(response_text.split())
+        comprehension_score, curiosity_score, confidence_score = self._score_text(response_text)
+        return {
+            'comprehension_score': comprehension_score,
+            'curiosity_score': curiosity_score,
+            'confidence_score': confidence_score,
+            'timestamp': now_iso or datetime.now().isoformat()
+        }
+    
+    def score_responses(self, responses: List[str]) -> List[Tuple[float, float, float]]:
+        """
+        Score a batch of responses without building per-response assessment dicts.
+        
+        Args:
+            responses: Response texts to score
+            
+        Returns:
+            (comprehension, curiosity, confidence) tuples in input order
+        """
+        score_text = self._score_text
+        return [score_text(text) for text in responses]
+    
+    @classmethod
+    @lru_cache(maxsize=2048)
+    def _score_text(cls, response_text: str) -> Tuple[float, float, float]:
+        """Score a response as (comprehension, curiosity, confidence); pure, so memoized on the text."""
+        words = response_text.lower().split()
+        word_count = len(words)
+        question_count = response_text.count('?')
+        strip_chars = cls._TOKEN_STRIP
+        tokens = [token for token in (word.strip(strip_chars) for word in words) if token]
+        grams = set(tokens)
+        for size in cls._PHRASE_SIZES:
+            grams.update(zip(*(tokens[i:] for i in range(size))))
         
         # Calculate comprehension indicators
-        high_indicators = sum(1 for word in self.COMPREHENSION_KEYWORDS['high'] if word in response_lower)
-        medium_indicators = sum(1 for word in self.COMPREHENSION_KEYWORDS['medium'] if word in response_lower)
-        low_indicators = sum(1 for word in self.COMPREHENSION_KEYWORDS['low'] if word in response_lower)
-        curiosity_indicators = sum(1 for word in self.COMPREHENSION_KEYWORDS['curiosity'] if word in response_lower)
+        high_indicators = cls._count_indicators('high', grams)
+        medium_indicators = cls._count_indicators('medium', grams)
+        low_indicators = cls._count_indicators('low', grams)
+        curiosity_indicators = cls._count_indicators('curiosity', grams)
         
         # Comprehension score (0-1)
-        comprehension_score = min(1.0, (high_indicators * 0.3 + 
-                                       medium_indicators * 0.15 - 
-                                       low_indicators * 0.2 + 
-                                       0.5))  # Base score
+        comprehension_score = (high_indicators * 0.3 + 
+                               medium_indicators * 0.15 - 
+                               low_indicators * 0.2 + 
+                               0.5)  # Base score
         
-        # Curiosity score (0-1) - high curiosity is positive
-        curiosity_score = min(1.0, curiosity_indicators * 0.2 + 0.3)
+        # Curiosity score (0-1) - high curiosity is positive; never below its 0.3 base
+        curiosity_score = curiosity_indicators * 0.2 + 0.3
         
         # Confidence score based on response length and clarity
         confidence_score = min(1.0, word_count / 50.0 + 0.3)  # Longer = more confident
         
         # Adjust based on question marks (questions indicate uncertainty or curiosity)
-        question_count = response_text.count('?')
         if question_count > 2:
             confidence_score *= 0.8
-            curiosity_score = min(1.0, curiosity_score + 0.2)
-        
-        return {
-            'comprehension_score': max(0.0, min(1.0, comprehension_score)),
-            'curiosity_score': max(0.0, min(1.0, curiosity_score)),
-            'confidence_score': max(0.0, min(1.0, confidence_score)),
-            'timestamp': datetime.now().isoformat()
-        }
+            curiosity_score += 0.2
+        
+        # Single clamp per score; only comprehension can drop below zero
+        return (
+            0.0 if comprehension_score < 0.0 else 1.0 if comprehension_score > 1.0 else comprehension_score,
+            1.0 if curiosity_score > 1.0 else curiosity_score,
+            confidence_score,
+        )
+    
+    @classmethod
+    def _count_indicators(cls, category: str, grams: Set[object]) -> int:
+        """Count the category's keywords and phrases present in the response (each at most once)."""
+        return sum(1 for key in cls._COMP_KEYS[category] if key in grams)
     
     def update_skill_level(self, topic: str, difficulty: int, performance_score: float):
         """
@@ -109,18 +287,30 @@ class AdaptiveLearningEngine:
             difficulty: Current difficulty level (1-5)
             performance_score: How well they did (0-1)
         """
-        if topic not in self.skill_matrix:
-            self.skill_matrix[topic] = {}
+        row = self.skill_matrix.get(topic)
+        if row is None:
+            topic = sys.intern(topic)
+            row = self.skill_matrix[topic] = [None] * self.EXPERT
+        index = min(self.EXPERT, max(self.BEGINNER, difficulty)) - 1
         
         # Exponential moving average for smooth transitions
         alpha = 0.3  # Learning rate
-        if difficulty in self.skill_matrix[topic]:
-            old_score = self.skill_matrix[topic][difficulty]
+        old_score = row[index]
+        if old_score is not None:
             new_score = alpha * performance_score + (1 - alpha) * old_score
+            self._topic_sums[topic] += new_score - old_score
         else:
             new_score = performance_score
+            self._topic_sums[topic] = self._topic_sums.get(topic, 0.0) + new_score
+            self._topic_counts[topic] = self._topic_counts.get(topic, 0) + 1
+        
+        row[index] = new_score
+        self._avg_dirty = True
         
-        self.skill_matrix[topic][difficulty] = new_score
+        if self._in_zpd(self._topic_sums[topic] / self._topic_counts[topic]):
+            self._zpd_topics[topic] = None
+        else:
+            self._zpd_topics.pop(topic, None)
     
     def get_optimal_difficulty(self, topic: str, current_difficulty: int) -> int:
         """
@@ -136,14 +326,16 @@ class AdaptiveLearningEngine:
         if topic not in self.skill_matrix:
             return self.ELEMENTARY  # Start at elementary for new topics
         
-        scores = self.skill_matrix[topic]
+        # Same clamp as update_skill_level, so out-of-range levels read the slot they were written to
+        level = min(self.EXPERT, max(self.BEGINNER, current_difficulty))
+        score = self.skill_matrix[topic][level - 1]
         
         # If mastery at current level (>0.8), increase difficulty
-        if current_difficulty in scores and scores[current_difficulty] > 0.8:
+        if score is not None and score > 0.8:
             return min(self.EXPERT, current_difficulty + 1)
         
         # If struggling at current level (<0.4), decrease difficulty
-        if current_difficulty in scores and scores[current_difficulty] < 0.4:
+        if score is not None and score < 0.4:
             return max(self.BEGINNER, current_difficulty - 1)
         
         # Otherwise, stay at current level
@@ -161,20 +353,16 @@ class AdaptiveLearningEngine:
             Recommended next topic
         """
         # Prioritize interests
-        interest_topics = [t for t in self.TOPICS if any(i.lower() in t.lower() for i in interests)]
-        
-        # Find topics with medium proficiency (ZPD sweet spot)
-        zpd_topics = []
-        for topic, scores in self.skill_matrix.items():
-            avg_score = sum(scores.values()) / len(scores) if scores else 0.5
-            if 0.4 <= avg_score <= 0.7:  # Not too easy, not too hard
-                zpd_topics.append(topic)
+        interests_lc = [i.lower() for i in interests]
+        interest_topics = [t for t, tl in self._TOPICS_LC if any(i in tl for i in interests_lc)]
         
-        # Combine strategies
-        candidates = list(set(interest_topics + zpd_topics))
+        # Topics with medium proficiency (ZPD sweet spot) are tracked on every skill update
+        zpd_topics = list(self._zpd_topics)
         
-        # Filter out recently covered topics
-        candidates = [t for t in candidates if t not in recent_topics[-3:]]
+        # Combine strategies (order-preserving dedup keeps the pick deterministic)
+        # and filter out recently covered topics
+        recent_set = set(recent_topics[-3:])
+        candidates = [t for t in dict.fromkeys(interest_topics + zpd_topics) if t not in recent_set]
         
         # Return best candidate or random interest
         if candidates:
@@ -206,44 +394,12 @@ class AdaptiveLearningEngine:
         # Calculate average recent comprehension
         avg_comp = 0.7  # Default
         if recent_comprehension:
-            scores = [c['comprehension_score'] for c in recent_comprehension[-5:]]
-            avg_comp = sum(scores) / len(scores)
+            avg_comp = fmean(c['comprehension_score'] for c in recent_comprehension[-5:])
         
         # Adjust instructions based on comprehension
-        if avg_comp < 0.5:
-            guidance = """
-            - Use VERY simple language and short sentences
-            - Provide more examples and analogies
-            - Break concepts into tiny steps
-            - Check understanding after each point
-            - Be extra encouraging and patient
-            """
-        elif avg_comp < 0.7:
-            guidance = """
-            - Use clear, age-appropriate language
-            - Provide examples when needed
-            - Build on what they already understand
-            - Ask guiding questions
-            - Encourage exploration
-            """
-        else:  # High comprehension
-            guidance = """
-            - Introduce more complex concepts
-            - Challenge with "what if" scenarios
-            - Encourage deeper analysis
-            - Connect multiple concepts
-            - Celebrate their advanced thinking
-            """
+        guidance = self._GUIDANCE_BY_LEVEL[bisect_right(self._GUIDANCE_THRESHOLDS, avg_comp)]
         
-        difficulty_map = {
-            1: "foundational concepts using everyday examples",
-            2: "elementary principles with hands-on connections",
-            3: "intermediate ideas with real-world applications",
-            4: "advanced concepts with critical thinking challenges",
-            5: "expert-level exploration with creative problem-solving"
-        }
-        
-        difficulty_desc = difficulty_map.get(difficulty, difficulty_map[2])
+        difficulty_desc = self._DIFFICULTY_DESC.get(difficulty, self._DIFFICULTY_DESC[2])
         
         return f"""
         Current Learning Context for {child_name}:
@@ -278,11 +434,12 @@ class AdaptiveLearningEngine:
         strengths = []
         growth_areas = []
         
-        for topic, scores in self.skill_matrix.items():
-            if not scores:
-                continue
-            avg_score = sum(scores.values()) / len(scores)
-            max_difficulty = max(scores.keys())
+        mastery_total = 0.0
+        
+        for topic, avg_score in self._topic_averages().items():
+            mastery_total += avg_score
+            row = self.skill_matrix[topic]
+            max_difficulty = max(i for i, score in enumerate(row, start=1) if score is not None)
             
             if avg_score > 0.7:
                 strengths.append({
@@ -322,10 +479,7 @@ class AdaptiveLearningEngine:
             'growth_areas': growth_areas[:2],  # Top 2
             'recommendations': recommendations,
             'topics_explored': len(self.skill_matrix),
-            'avg_mastery': sum(
-                sum(scores.values()) / len(scores) 
-                for scores in self.skill_matrix.values() if scores
-            ) / len(self.skill_matrix) if self.skill_matrix else 0
+            'avg_mastery': mastery_total / len(self.skill_matrix)
         }
     
     def should_introduce_challenge(self, recent_responses: List[Dict[str, Any]]) -> bool:
@@ -342,12 +496,11 @@ class AdaptiveLearningEngine:
             return False
         
         # Check if last 3 responses show high comprehension
-        recent_comp = [r.get('comprehension_score', 0.5) for r in recent_responses[-3:]]
-        avg_recent = sum(recent_comp) / len(recent_comp)
+        last_three = recent_responses[-3:]
+        avg_recent = fmean(r.get('comprehension_score', 0.5) for r in last_three)
         
         # Check if curiosity is high
-        recent_curiosity = [r.get('curiosity_score', 0.5) for r in recent_responses[-3:]]
-        avg_curiosity = sum(recent_curiosity) / len(recent_curiosity)
+        avg_curiosity = fmean(r.get('curiosity_score', 0.5) for r in last_three)
         
         return avg_recent > 0.75 and avg_curiosity > 0.6
     
@@ -355,15 +508,19 @@ class AdaptiveLearningEngine:
         """Export engine state for persistence."""
         return {
             'skill_matrix': self.skill_matrix,
-            'comprehension_history': self.comprehension_history[-50:],  # Keep last 50
-            'question_history': self.question_history[-50:],
+            'comprehension_history': self.comprehension_history[-self.HISTORY_LIMIT:],  # Keep last 50
+            'question_history': self.question_history[-self.HISTORY_LIMIT:],
             'last_updated': datetime.now().isoformat()
         }
     
     def get_state(self) -> str:
         """Return persisted state as JSON string."""
+        # State is JSON-native (str topic keys, score lists, ISO timestamps), so no default= hook
+        state = self.to_dict()
         try:
-            return json.dumps(self.to_dict(), default=str)
+            if orjson is not None:
+                return orjson.dumps(state).decode()
+            return json.dumps(state, separators=(',', ':'))
         except Exception:
             return json.dumps({})
     
@@ -371,9 +528,9 @@ class AdaptiveLearningEngine:
     def from_dict(cls, data: Dict[str, Any]) -> 'AdaptiveLearningEngine':
         """Load engine state from persisted data."""
         engine = cls()
-        engine.skill_matrix = data.get('skill_matrix', {})
-        engine.comprehension_history = data.get('comprehension_history', [])
-        engine.question_history = data.get('question_history', [])
+        engine.skill_matrix = data.get('skill_matrix', {}) or {}
+        engine.comprehension_history = list(data.get('comprehension_history', []) or [])[-cls.HISTORY_LIMIT:]
+        engine.question_history = list(data.get('question_history', []) or [])[-cls.HISTORY_LIMIT:]
         return engine
 
 
@@ -393,36 +550,37 @@ def analyze_conversation_for_learning(
     Returns:
         Analysis with comprehension trends, engagement, and recommendations
     """
-    user_messages = [m for m in messages if m['role'] == 'user']
-    
-    if not user_messages:
+    if not any(m['role'] == 'user' for m in messages):
         return {'status': 'no_data'}
     
-    # Analyze each user message
-    comprehension_scores = []
-    for msg in user_messages:
-        assessment = engine.assess_comprehension(msg['content'], {})
-        comprehension_scores.append(assessment)
+    # Only the user texts are needed downstream
+    user_texts = [m['content'] for m in messages if m['role'] == 'user']
+    
+    # Score all user messages in one batch, then split each metric into its own column
+    scores = engine.score_responses(user_texts)
+    comprehension = [score[0] for score in scores]
+    curiosity = [score[1] for score in scores]
+    count = len(scores)
     
     # Calculate trends
-    if len(comprehension_scores) > 1:
-        early_avg = sum(c['comprehension_score'] for c in comprehension_scores[:2]) / 2
-        late_avg = sum(c['comprehension_score'] for c in comprehension_scores[-2:]) / 2
+    if count > 1:
+        early_avg = (comprehension[0] + comprehension[1]) / 2
+        late_avg = (comprehension[-2] + comprehension[-1]) / 2
         growth = late_avg - early_avg
     else:
         growth = 0
     
-    avg_comprehension = sum(c['comprehension_score'] for c in comprehension_scores) / len(comprehension_scores)
-    avg_curiosity = sum(c['curiosity_score'] for c in comprehension_scores) / len(comprehension_scores)
+    avg_comprehension = fmean(comprehension)
+    avg_curiosity = fmean(curiosity)
     
     return {
         'status': 'analyzed',
-        'message_count': len(user_messages),
+        'message_count': count,
         'avg_comprehension': avg_comprehension,
         'avg_curiosity': avg_curiosity,
         'growth_trend': growth,
-        'engagement_level': 'high' if avg_curiosity > 0.6 else 'medium' if avg_curiosity > 0.4 else 'low',
-        'comprehension_level': 'strong' if avg_comprehension > 0.7 else 'developing' if avg_comprehension > 0.5 else 'needs_support',
+        'engagement_level': _ENGAGEMENT_LABELS[bisect_left(_ENGAGEMENT_THRESHOLDS, avg_curiosity)],
+        'comprehension_level': _COMPREHENSION_LABELS[bisect_left(_COMPREHENSION_THRESHOLDS, avg_comprehension)],
         'ready_for_next_level': avg_comprehension > 0.8 and growth >= 0,
         'needs_reinforcement': avg_comprehension < 0.5 or growth < -0.2,
         'topic': topic
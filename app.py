@@ -1,4 +1,6 @@
-import base64
+from __future__ import annotations
+
+import copy
 import datetime
 import hashlib
 import io
@@ -7,22 +9,39 @@ import math
 import os
 import random
 import re
+import string
 import tempfile
 import time
 import uuid
+import zlib
 
-import requests
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from html import escape
-from functools import lru_cache
 from pathlib import Path
-from urllib.parse import quote_plus
-from typing import Dict, List, Optional, Tuple
+from types import MappingProxyType
+from urllib.parse import quote, quote_plus
+from typing import TYPE_CHECKING, Dict, List, Optional, Sequence, Tuple
 
 import streamlit as st
-from supabase import Client, create_client
-from openai import OpenAI
 
-from content_feed import load_feed, add_feed_entry, delete_feed_entry
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    _parse_iso = None
+
+if TYPE_CHECKING:
+    import requests
+    from openai import OpenAI
+    from supabase import Client
+
+from content_feed import load_feed, add_feed_entry, delete_feed_entry, feed_version
 from db_utils import (
     add_points,
     add_user_mission,
@@ -37,49 +56,58 @@ from db_utils import (
     save_diary,
     upsert_family_profile,
     streak_days,
-    total_points,
     last_mission_date,
-    recent_tag_counts,
+    weekly_dashboard,
     weekly_summary,
     update_project_details,
 )
 
-def _noop_seed() -> None:
-    pass
+import db_utils as _db_utils
 
-ensure_default_silentgpt_data = _noop_seed
+_SILENTGPT_MISSING: List[str] = []
+
+
+def _silentgpt_helper(name: str):
+    """Return a db_utils helper, or a stub that explains the stale deploy when it is missing."""
+    helper = getattr(_db_utils, name, None)
+    if helper is not None:
+        return helper
 
-try:
-    from db_utils import (
-        add_message,
-        archive_project,
-        archive_thread,
-        create_child_profile,
-        create_project,
-        create_thread,
-        get_child_profile,
-        get_project,
-        get_thread_messages,
-        list_child_profiles,
-        list_projects,
-        list_threads,
-        rename_project,
-        rename_thread,
-        search_messages,
-    )
-except ImportError as import_exc:
     def _silentgpt_missing(*_, **__):
         raise ImportError(
             "SilentGPT features need the latest db_utils helpers. "
-            "Redeploy after pulling the newest code (missing: add_message/archive_project/etc)."
-        ) from import_exc
-
-    add_message = archive_project = archive_thread = create_child_profile = create_project = create_thread = (
-        get_child_profile
-    ) = get_project = get_thread_messages = list_child_profiles = list_projects = list_threads = rename_project = (
-        rename_thread
-    ) = search_messages = _silentgpt_missing
-else:
+            f"Redeploy after pulling the newest code (missing: {name})."
+        )
+
+    _SILENTGPT_MISSING.append(name)
+    return _silentgpt_missing
+
+
+add_message = _silentgpt_helper("add_message")
+archive_project = _silentgpt_helper("archive_project")
+archive_thread = _silentgpt_helper("archive_thread")
+create_child_profile = _silentgpt_helper("create_child_profile")
+create_project = _silentgpt_helper("create_project")
+create_thread = _silentgpt_helper("create_thread")
+get_child_profile = _silentgpt_helper("get_child_profile")
+get_project = _silentgpt_helper("get_project")
+get_thread_messages = _silentgpt_helper("get_thread_messages")
+list_child_profiles = _silentgpt_helper("list_child_profiles")
+list_projects = _silentgpt_helper("list_projects")
+list_projects_for_children = _silentgpt_helper("list_projects_for_children")
+list_threads = _silentgpt_helper("list_threads")
+rename_project = _silentgpt_helper("rename_project")
+rename_thread = _silentgpt_helper("rename_thread")
+search_messages = _silentgpt_helper("search_messages")
+
+
+def _noop_seed() -> None:
+    pass
+
+
+ensure_default_silentgpt_data = _noop_seed
+
+if not _SILENTGPT_MISSING:
     def ensure_default_silentgpt_data() -> None:
         """Populate a starter explorer/adventure if deploys start empty."""
         try:
@@ -108,56 +136,129 @@ else:
             )
 
 
-@st.cache_data(ttl=30)
+TAGGED_CACHE_MAX_ENTRIES = 4096
+
+
+@st.cache_resource(show_spinner=False)
+def _tagged_cache() -> Dict[tuple, Tuple[float, object]]:
+    """Process-wide store keyed by (kind, owner, args) so writes can invalidate surgically."""
+    return {}
+
+
+def _cache_owner() -> str:
+    session = st.session_state.get("supabase_session") or {}
+    return session.get("user_id") or ""
+
+
+def _tagged_get(kind: str, ttl: float, loader, *args):
+    cache = _tagged_cache()
+    key = (kind, _cache_owner(), args)
+    now = time.monotonic()
+    entry = cache.get(key)
+    if entry is None or now - entry[0] > ttl:
+        entry = (now, loader(*args))
+        # Re-insert rather than overwrite so dict order stays oldest-stamp first
+        cache.pop(key, None)
+        overflow = len(cache) - TAGGED_CACHE_MAX_ENTRIES + 1
+        if overflow > 0:
+            for old_key in list(cache)[:overflow]:
+                cache.pop(old_key, None)
+        cache[key] = entry
+    # The store is shared across sessions, so hand out a copy the caller can
+    # mutate freely, the same way st.cache_data does.
+    return copy.deepcopy(entry[1])
+
+
+def invalidate_tagged(*kinds: str, args_prefix: tuple = ()) -> None:
+    """Drop the current user's entries for the given kinds, leaving other users warm.
+
+    With ``args_prefix`` only entries whose arguments start with it are dropped,
+    e.g. the threads of a single project.
+    """
+    cache = _tagged_cache()
+    owner = _cache_owner()
+    wanted = set(kinds)
+    width = len(args_prefix)
+    for key in list(cache):
+        if key[0] in wanted and key[1] == owner and key[2][:width] == args_prefix:
+            cache.pop(key, None)
+
+
 def cached_child_profiles():
-    return list_child_profiles()
+    return _tagged_get("children", 30, list_child_profiles)
+
+
+def cached_child_profile(child_id: int):
+    # Shares the "children" tag so any explorer invalidation drops it too.
+    return _tagged_get("children", 30, get_child_profile, child_id)
+
+
+def cached_project(project_id: int):
+    return _tagged_get("projects", 30, get_project, project_id)
 
 
-@st.cache_data(ttl=30)
-def cached_projects(child_id: int, include_archived: bool = False):
-    return list_projects(child_id, include_archived)
+def cached_projects_bulk(child_ids: Tuple[int, ...], include_archived: bool = False) -> Dict[int, list]:
+    """Projects for every explorer in one round trip; switching explorers then hits the cache."""
+    return _tagged_get("projects", 30, list_projects_for_children, child_ids, include_archived)
 
 
-@st.cache_data(ttl=30)
 def cached_threads(project_id: int, include_archived: bool = False):
-    return list_threads(project_id, include_archived)
+    return _tagged_get("threads", 30, list_threads, project_id, include_archived)
 
 
-@st.cache_data(ttl=30)
 def cached_thread_messages(thread_id: int):
-    return get_thread_messages(thread_id)
+    return _tagged_get("messages", 30, get_thread_messages, thread_id)
+
+
+def invalidate_coach_caches(*kinds: str) -> None:
+    invalidate_tagged(*(kinds or ("children", "projects", "threads", "messages")))
+
+
+def invalidate_threads_for(project_id: int) -> None:
+    invalidate_tagged("threads", args_prefix=(project_id,))
+
+
+def invalidate_messages_for(thread_id: int) -> None:
+    invalidate_tagged("messages", args_prefix=(thread_id,))
+
+
+def cached_weekly_bundle(days: int = 7):
+    """Tag counts and point total from the single dashboard_weekly RPC."""
+    return _tagged_get("weekly_bundle", 60, weekly_dashboard, days)
 
 
-@st.cache_data(ttl=60)
 def cached_recent_tags(days: int = 7):
-    return recent_tag_counts(days)
+    return cached_weekly_bundle(days)[0]
 
 
-@st.cache_data(ttl=60)
 def cached_week_summary(days: int = 7):
-    return weekly_summary(days)
+    return _tagged_get("week_summary", 60, weekly_summary, days)
+
+
+def cached_total_points() -> int:
+    return cached_weekly_bundle()[1]
 
 
 def invalidate_progress_caches() -> None:
-    cached_recent_tags.clear()
-    cached_week_summary.clear()
+    invalidate_tagged("weekly_bundle")
+    invalidate_tagged("week_summary")
 
 
-@st.cache_data(ttl=300)
 def cached_family_profile(family_id: str):
-    return get_family_profile(family_id)
+    return _tagged_get("family_profile", 300, get_family_profile, family_id)
 
 
-@st.cache_data(ttl=120)
 def cached_interest_progress(family_id: str):
-    return list_interest_progress(family_id)
+    return _tagged_get("interest_progress", 120, list_interest_progress, family_id)
 
 
 def invalidate_family_caches() -> None:
-    cached_family_profile.clear()
-    cached_interest_progress.clear()
+    invalidate_tagged("family_profile", "interest_progress")
 from silencegpt_prompt import build_system_prompt
-from silencegpt_api import chat_completion
+from silencegpt_api import chat_completion_stream, get_openai_client
+
+# Pre-bound for the per-rerun pick sites below
+_choice = random.choice
 
 APP_NAME = "The Silent Room"
 COACH_TITLE = "Inner Mentor"
@@ -167,7 +268,9 @@ DATA_DIR = APP_ROOT / "data"
 DATA_DIR.mkdir(exist_ok=True)
 DIARY_DIR = APP_ROOT / "diaries"
 DIARY_DIR.mkdir(exist_ok=True)
-ASSET_DIR = APP_ROOT / "assets" / "backgrounds"
+# Served at app/static/ (server.enableStaticServing in .streamlit/config.toml)
+STATIC_DIR = APP_ROOT / "static"
+ASSET_DIR = STATIC_DIR / "backgrounds"
 BACKGROUND_IMAGES = {
     "coach": ASSET_DIR / "lab.jpg",
     "gallery": ASSET_DIR / "space.jpg",
@@ -175,14 +278,21 @@ BACKGROUND_IMAGES = {
     "parents": ASSET_DIR / "warm.jpg",
 }
 
-def get_config(name: str, default: Optional[str] = None) -> Optional[str]:
+@st.cache_resource(show_spinner=False)
+def get_config(name: str, default: Optional[str] = None, prefer_secrets: bool = False) -> Optional[str]:
+    # cache_resource rather than lru_cache: the script body re-runs on every
+    # interaction, so a plain lru_cache would be rebuilt each time.
+    # API keys and share URLs have always been read from secrets first, so
+    # those call sites pass prefer_secrets=True; everything else lets the
+    # environment win.
     env_value = os.getenv(name)
-    if env_value:
+    if env_value and not prefer_secrets:
         return env_value
     try:
-        return st.secrets.get(name, default)
+        secret_value = st.secrets.get(name)
     except Exception:
-        return default
+        secret_value = None
+    return secret_value or env_value or default
 
 
 SUPABASE_URL = get_config("SUPABASE_URL")
@@ -200,6 +310,8 @@ ENABLE_BACKGROUNDS = (get_config("ENABLE_BACKGROUNDS", "1") or "1").strip().lowe
 def get_supabase_client() -> Optional[Client]:
     if not SUPABASE_URL or not SUPABASE_ANON_KEY:
         return None
+    from supabase import create_client
+
     try:
         return create_client(SUPABASE_URL, SUPABASE_ANON_KEY)
     except Exception:
@@ -210,17 +322,45 @@ def get_supabase_client() -> Optional[Client]:
 def get_supabase_admin_client() -> Optional[Client]:
     if not SUPABASE_URL or not SUPABASE_SERVICE_ROLE_KEY:
         return None
+    from supabase import create_client
+
     try:
         return create_client(SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY)
     except Exception:
         return None
 
 
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_profile_bundle(user_id: str) -> Tuple[Optional[dict], Optional[int]]:
+    """Fetch a profile and the community size in a single RPC round trip."""
+    admin_client = get_supabase_admin_client()
+    if admin_client is None or not user_id:
+        return None, None
+    try:
+        response = admin_client.rpc("get_profile_with_counts", {"uid": user_id}).execute()
+    except Exception:
+        return None, None
+    data = getattr(response, "data", None)
+    if not isinstance(data, dict):
+        return None, None
+    profile = dict(data)
+    total = profile.pop("total", None)
+    return (profile or None), total
+
+
 @st.cache_data(ttl=300, show_spinner=False)
-def fetch_total_profiles() -> Optional[int]:
+def _fetch_total_profiles_direct() -> Optional[int]:
     admin_client = get_supabase_admin_client()
     if admin_client is None:
         return None
+    try:
+        response = admin_client.table("profiles_stats").select("total").limit(1).execute()
+    except Exception:
+        response = None
+    data = getattr(response, "data", None)
+    if data:
+        return data[0].get("total")
+    # Materialized view not deployed yet; fall back to an exact count
     try:
         response = admin_client.table("profiles").select("id", count="exact").limit(1).execute()
         return getattr(response, "count", None)
@@ -228,9 +368,24 @@ def fetch_total_profiles() -> Optional[int]:
         return None
 
 
+def fetch_total_profiles() -> Optional[int]:
+    session = st.session_state.get("supabase_session") or {}
+    user_id = session.get("user_id")
+    if user_id:
+        _, total = fetch_profile_bundle(user_id)
+        if total is not None:
+            return total
+    return _fetch_total_profiles_direct()
+
+
+def invalidate_profile_caches() -> None:
+    fetch_profile_bundle.clear()
+
+
 def supabase_logout() -> None:
     st.session_state.pop("supabase_session", None)
     st.session_state.pop("supabase_profile", None)
+    invalidate_profile_caches()
     st.rerun()
 
 
@@ -238,12 +393,17 @@ def parse_timestamp(timestamp: Optional[str]) -> Optional[datetime.datetime]:
     if not timestamp:
         return None
     try:
+        if _parse_iso is not None:
+            return _parse_iso(timestamp)
         return datetime.datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
     except ValueError:
         return None
 
 
 def fetch_supabase_profile(client: Client, user_id: str) -> Optional[dict]:
+    profile, _ = fetch_profile_bundle(user_id)
+    if profile is not None:
+        return profile
     try:
         response = client.table("profiles").select(
             "subscription_status, trial_ends_at, stripe_customer_id, email, display_name, hero_dream, avatar_theme"
@@ -282,6 +442,7 @@ def update_supabase_profile(updates: dict) -> Optional[dict]:
     except Exception as exc:
         st.error(f"Could not update hero profile: {exc}")
         return None
+    invalidate_profile_caches()
     data = getattr(response, "data", None)
     if data:
         st.session_state["supabase_profile"] = data[0]
@@ -293,22 +454,37 @@ def update_supabase_profile(updates: dict) -> Optional[dict]:
     return profile
 
 
+_SAFE_NAME_CHARS = frozenset(string.ascii_letters + string.digits + "._-")
+_SAFE_NAME_TABLE = str.maketrans({chr(c): "_" for c in range(128) if chr(c) not in _SAFE_NAME_CHARS})
+_UNSAFE_NAME_RE = re.compile(r"[^0-9A-Za-z._-]")
+
+
+def _safe_filename(name: str) -> str:
+    # The translate table only covers ASCII; anything else goes through the regex.
+    if name.isascii():
+        return name.translate(_SAFE_NAME_TABLE)
+    return _UNSAFE_NAME_RE.sub("_", name)
+
+
 def upload_hub_media(file) -> Optional[str]:
     """Upload to knowledge-hub and return permanent public URL."""
-    if not file:
-        return None
-    bytes_data = file.getvalue()
-    if not bytes_data:
+    return _upload_hub_file(get_supabase_admin_client(), file)
+
+
+def _upload_hub_file(admin_client: Optional[Client], file) -> Optional[str]:
+    """Upload body for upload_hub_media; takes the client so it can run off the script thread."""
+    if not file or not getattr(file, "size", 0):
         return None
-    admin_client = get_supabase_admin_client()
     if admin_client is None or not SUPABASE_HUB_BUCKET:
         return None
-    safe_name = re.sub(r"[^0-9A-Za-z._-]", "_", file.name or "hub_asset")
+    safe_name = _safe_filename(file.name or "hub_asset")
     file_name = f"{uuid.uuid4()}_{safe_name}"
     try:
+        # Copy the upload buffer into bytes once; wrapping the UploadedFile in a
+        # reader would close it when the wrapper is garbage-collected.
         admin_client.storage.from_(SUPABASE_HUB_BUCKET).upload(
             path=file_name,
-            file=bytes_data,
+            file=bytes(file.getbuffer()),
             file_options={"content-type": file.type or "application/octet-stream", "upsert": False},
         )
         return admin_client.storage.from_(SUPABASE_HUB_BUCKET).get_public_url(file_name)
@@ -358,6 +534,24 @@ def render_hero_profile(profile: Optional[dict]) -> None:
         st.rerun()
 
 
+@st.cache_resource(show_spinner=False)
+def _http_session() -> requests.Session:
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    # POST is not in Retry's default allowed methods, so only connection
+    # failures are retried for Edge Function calls.
+    retry = Retry(total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+    session.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=retry))
+    return session
+
+
+# (connect, read): fail fast on an unreachable host, but give Edge Functions time to answer
+EDGE_FUNCTION_TIMEOUT = (3, 20)
+
+
 def invoke_supabase_function(name: str, payload: dict) -> Optional[dict]:
     if not SUPABASE_URL:
         return None
@@ -370,11 +564,14 @@ def invoke_supabase_function(name: str, payload: dict) -> Optional[dict]:
         headers["Authorization"] = f"Bearer {token}"
     endpoint = f"{SUPABASE_URL}/functions/v1/{name}"
     try:
-        response = requests.post(endpoint, headers=headers, json=payload, timeout=20)
+        if orjson is not None:
+            response = _http_session().post(endpoint, headers=headers, data=orjson.dumps(payload), timeout=EDGE_FUNCTION_TIMEOUT)
+        else:
+            response = _http_session().post(endpoint, headers=headers, json=payload, timeout=EDGE_FUNCTION_TIMEOUT)
         if response.status_code >= 400:
             return None
         if response.headers.get("Content-Type", "").startswith("application/json"):
-            return response.json()
+            return orjson.loads(response.content) if orjson is not None else response.json()
         return None
     except Exception:
         return None
@@ -382,9 +579,10 @@ def invoke_supabase_function(name: str, payload: dict) -> Optional[dict]:
 
 def handle_checkout_redirect() -> Optional[str]:
     params = st.query_params
-    status_list = params.get("status")
-    if status_list:
-        status = status_list[0]
+    status = params.get("status")
+    if isinstance(status, list):
+        status = status[0] if status else None
+    if status:
         st.session_state["checkout_status"] = status
         remaining = {k: v for k, v in params.items() if k != "status"}
         st.experimental_set_query_params(**remaining)
@@ -440,6 +638,7 @@ def supabase_login_ui(client: Client) -> None:
                     if not getattr(result, "user", None):
                         feedback.error("No user returned. Check credentials or confirm your email.")
                     else:
+                        invalidate_profile_caches()
                         profile = fetch_supabase_profile(client, result.user.id)
                         st.session_state["supabase_session"] = {
                             "access_token": result.session.access_token if result.session else "",
@@ -453,6 +652,15 @@ def supabase_login_ui(client: Client) -> None:
         st.stop()
 
 
+_CHECKOUT_LINK_TMPL = string.Template(
+    '<a href="$url" target="_blank" rel="noopener noreferrer" '
+    'class="stButton" style="display:inline-flex;align-items:center;'
+    'justify-content:center;padding:0.6rem 1.2rem;border-radius:6px;'
+    'background-color:#FF6F61;color:white;text-decoration:none;font-weight:600;">'
+    'Open payment page ↗</a>'
+)
+
+
 def render_subscription_cta(profile: Optional[dict], status: Optional[str]) -> None:
     st.warning(
         "Your Silent Room membership needs an active subscription. Start the free month or manage billing below."
@@ -491,11 +699,7 @@ def render_subscription_cta(profile: Optional[dict], status: Optional[str]) -> N
     if checkout_url:
         st.success("Secure checkout is ready.")
         st.markdown(
-            f'<a href="{checkout_url}" target="_blank" rel="noopener noreferrer" '
-            'class="stButton" style="display:inline-flex;align-items:center;'
-            'justify-content:center;padding:0.6rem 1.2rem;border-radius:6px;'
-            'background-color:#FF6F61;color:white;text-decoration:none;font-weight:600;">'
-            'Open payment page ↗</a>',
+            _CHECKOUT_LINK_TMPL.substitute(url=escape(checkout_url)),
             unsafe_allow_html=True,
         )
         st.caption(
@@ -517,19 +721,30 @@ def render_subscription_cta(profile: Optional[dict], status: Optional[str]) -> N
     if portal_url:
         st.success("Opening customer portal…")
         st.markdown(
-            f'<meta http-equiv="refresh" content="0; url={portal_url}" />',
+            f'<meta http-equiv="refresh" content="0; url={escape(portal_url)}" />',
             unsafe_allow_html=True,
         )
     st.session_state.pop("checkout_status", None)
 
 
+_PAID_STATES = frozenset({"active", "trialing"})
+
+
 def has_paid_access(profile: Optional[dict]) -> bool:
     if not profile:
         return False
     status = (profile.get("subscription_status") or "").lower()
-    if status in {"active", "trialing"}:
+    if status in _PAID_STATES:
         return True
-    trial_ends_at = parse_timestamp(profile.get("trial_ends_at"))
+    # Reuse the parsed trial end while the raw value is unchanged; the
+    # comparison against "now" still runs every time so expiry stays exact.
+    raw_trial_end = profile.get("trial_ends_at")
+    cached = st.session_state.get("_trial_ends_at_parsed")
+    if cached is not None and cached[0] == raw_trial_end:
+        trial_ends_at = cached[1]
+    else:
+        trial_ends_at = parse_timestamp(raw_trial_end)
+        st.session_state["_trial_ends_at_parsed"] = (raw_trial_end, trial_ends_at)
     if trial_ends_at and trial_ends_at > datetime.datetime.now(datetime.timezone.utc):
         return True
     return False
@@ -555,8 +770,11 @@ def ensure_supabase_access() -> Optional[Client]:
         supabase_login_ui(client)
     user_id = session.get("user_id")
     profile = st.session_state.get("supabase_profile")
-    refresh_needed = bool(st.session_state.get("checkout_status")) and user_id
+    # Only a completed checkout can change billing fields; a canceled one keeps the cached profile.
+    refresh_needed = (st.session_state.get("checkout_status") or "").lower() == "success" and user_id
     if (profile is None or refresh_needed) and user_id:
+        if refresh_needed:
+            invalidate_profile_caches()
         profile = fetch_supabase_profile(client, user_id)
         st.session_state["supabase_profile"] = profile
     if not profile:
@@ -594,32 +812,38 @@ Modes: Spark / Build / Think / Write / Share. If unclear, pick one.
 Output: shining bullets, one action now, one reflective question, one fun stretch goal.
 """
 
-MODE_OPTIONS: List[Tuple[str, str, str]] = [
+MODE_OPTIONS: Tuple[Tuple[str, str, str], ...] = (
     ("Spark", "💡", "Ignite a fresh question or big idea."),
     ("Build", "🔧", "Plan an experiment or hands-on project."),
     ("Think", "🧠", "Slow down, analyze, and reason carefully."),
     ("Write", "✍️", "Turn discoveries into stories, notes, or diagrams."),
     ("Share", "🎤", "Teach someone else and celebrate progress."),
-]
+)
 
-MODE_TO_TAG = {
+MODE_TO_TAG = MappingProxyType({
     "Spark": "Curiosity",
     "Build": "Build",
     "Think": "Think",
     "Write": "Write",
     "Share": "Share",
-}
+})
+
+HERO_LINES = (
+    "Hello, Young Innovator.",
+    "Online. Ready to explore.",
+    "Systems check: Curiosity at 100%.",
+)
 
-GREETINGS = [
+GREETINGS = (
     "🌈 Let us chase a new idea today, Amritha!",
     "🧪 Ready to question the universe and test something bold?",
     "✨ Every scientist starts with curiosity—let's light yours!",
     "🚪 Step into The Silent Room—your calm lab awaits!",
     "🌟 Your ideas can heal the world—shall we begin?",
-]
+)
 
 
-MISSIONS = [
+MISSIONS = (
     "Find one weird thing about plants and explain it in your own words.",
     "Ask how clouds float and draw a sky story about it.",
     "Design a superhero scientist who protects the oceans.",
@@ -627,136 +851,136 @@ MISSIONS = [
     "Invent a kindness experiment that makes three friends smile.",
     "Explore how to save energy at home and write a mini-plan.",
     "Create a question about space that no one has answered yet.",
-]
+)
 
-HEALTH_TIPS = [
+HEALTH_TIPS = (
     "Take a pencil break: stretch your hands, roll your shoulders, breathe deeply.",
     "Fuel your brain with water and a rainbow snack—colorful fruits power focus.",
     "Five-jump challenge: leap, laugh, repeat. Movement wakes up ideas!",
     "Sit like a scientist: straight back, relaxed shoulders, gentle breath.",
     "Sunshine check: peek outside for a minute and describe one happy detail.",
-]
+)
 
-KINDNESS_CHALLENGES = [
+KINDNESS_CHALLENGES = (
     "Share a thankful note with someone who helped you learn today.",
     "Pick up three tiny pieces of litter and recycle or trash them.",
     "Teach a younger friend the coolest fact you discovered this week.",
     "Listen to a family story and write down what wisdom it carries.",
     "Plant a kindness compliment in someone’s lunchbox or notebook.",
-]
+)
 
-EARTH_PROMISES = [
+EARTH_PROMISES = (
     "Use a reusable bottle all day and note how much water you drink.",
     "Switch off lights when sunshine is enough—be Earth’s energy hero.",
     "Sort today’s recycling and explain why each item fits its bin.",
     "Sketch a tiny poster about protecting trees and hang it proudly.",
     "Save water during tooth brushing and track the difference.",
-]
+)
 
-LEGEND_SPOTLIGHTS = [
+LEGEND_SPOTLIGHTS = (
     ("Mahabharata – Arjuna", "Practice focus like Arjuna aiming at the eye of the bird. Notice one detail deeply today."),
     ("Mahabharata – Bhishma", "Live with integrity like Bhishma. Promise yourself one action that keeps your word."),
     ("Ramayana – Hanuman", "Serve with courage like Hanuman. Help someone today without being asked."),
     ("Ramayana – Sita", "Be resilient like Sita. When a challenge feels hard, pause, breathe, and try one gentle step."),
     ("Global Peacemakers", "Kindness wins. Find a way to reduce conflict or calm hearts around you."),
-]
+)
 
-INSPIRATION_SNIPPETS = [
+INSPIRATION_SNIPPETS = (
     "Marie Curie said: 'I was taught that the way of progress is neither swift nor easy.'",
     "Katherine Johnson used math to guide rockets—numbers can take you to the stars!",
     "Wangari Maathai planted trees to change a nation. Every small action matters.",
     "Dr. Abdul Kalam called dreams the blueprint of the future. Sketch yours tonight!",
     "Ada Lovelace imagined computers before they existed. Your imagination is world-changing.",
     "Satya Nadella reads poetry for empathy. Mix art and science for superpowers.",
-]
-TAGGED_INSPIRATIONS = {
-    "Planet": [
+)
+TAGGED_INSPIRATIONS = MappingProxyType({
+    "Planet": (
         "🌍 Try a mini eco-experiment: measure indoor plant growth with and without sunlight.",
         "♻️ Design a recycling superhero who rescues oceans—what powers do they use?",
-    ],
-    "Kindness": [
+    ),
+    "Kindness": (
         "🤝 Create a gratitude note for someone who made your day brighter.",
         "💬 Practice empathy: ask a friend how they feel and listen deeply.",
-    ],
-    "Health": [
+    ),
+    "Health": (
         "💪 Build a 3-minute energizer routine—mix jumps, stretches, and a smile.",
         "🧘‍♀️ Try a breathing pattern: inhale 4, hold 4, exhale 6—how does it feel?",
-    ],
-    "Build": [
+    ),
+    "Build": (
         "🔧 Sketch a prototype for a gadget that solves a daily problem at home.",
         "🛠️ Rebuild an everyday object using LEGO or cardboard—what improves?",
-    ],
-    "Think": [
+    ),
+    "Think": (
         "🧠 Invent a logic puzzle about your favorite animal—can someone else solve it?",
         "🔍 Fact-check a science claim today. What evidence backs it up?",
-    ],
-    "Curiosity": [
+    ),
+    "Curiosity": (
         "✨ Collect three new questions about the world before dinner.",
         "🔭 Explore a topic you’ve never studied—write one WOW fact.",
-    ],
-}
+    ),
+})
 
-LEGEND_ALIGNMENT = {
+LEGEND_ALIGNMENT = MappingProxyType({
     "Mahabharata – Arjuna": "Think",
     "Mahabharata – Bhishma": "Kindness",
     "Ramayana – Hanuman": "Build",
     "Ramayana – Sita": "Health",
     "Global Peacemakers": "Planet",
-}
+})
 
 
 
-ACHIEVEMENT_BADGES = [
+ACHIEVEMENT_BADGES = (
     (50, "Curiosity Explorer"),
     (100, "Insight Inventor"),
     (200, "World Changer"),
-]
+)
 
-CELEBRATION_MESSAGES = [
+CELEBRATION_MESSAGES = (
     "Incredible spark, Amritha! You just leveled up your science superpowers!",
     "Boom! Another idea blossomed. Keep shining that brilliant mind!",
     "Your curiosity just planted a new tree of knowledge. Well done!",
     "High-five! That effort made the world a little kinder and smarter.",
-    "You’re on The Silent Room path—every step like this sends ripples of good."
-]
+    "You’re on The Silent Room path—every step like this sends ripples of good.",
+)
 
 
-CELEBRATION_BY_TAG = {
-    "Curiosity": [
+CELEBRATION_BY_TAG = MappingProxyType({
+    "Curiosity": (
         "Curiosity engines roaring—keep asking wild questions!",
         "Your wonder radar just pinged something amazing!",
-    ],
-    "Build": [
+    ),
+    "Build": (
         "Engineer alert! You just built brilliance out of thin air.",
         "Your maker hands turned an idea into reality!",
-    ],
-    "Think": [
+    ),
+    "Think": (
         "Logic lasers locked on target—fantastic reasoning!",
         "You balanced evidence like a true scientist!",
-    ],
-    "Write": [
+    ),
+    "Write": (
         "Your words sparkle like constellations in a night sky!",
         "Story power activated—keep capturing discoveries!",
-    ],
-    "Share": [
+    ),
+    "Share": (
         "Your voice just lit up someone else's brain!",
         "Teaching others made your knowledge twice as strong!",
-    ],
-    "Kindness": [
+    ),
+    "Kindness": (
         "Kindness ripple activated—hearts feel safer around you!",
         "You just proved kindness is a real-world superpower!",
-    ],
-    "Planet": [
+    ),
+    "Planet": (
         "Earth just smiled because of you!",
         "Planet heroes wear invisible capes—you've got one now!",
-    ],
-    "Health": [
+    ),
+    "Health": (
         "Strong body, bright brain—what a combo!",
         "You treated your body like the lab of your dreams!",
-    ],
-}
+    ),
+})
 
-POINT_LABEL_BY_TAG = {
+POINT_LABEL_BY_TAG = MappingProxyType({
     "Curiosity": "curiosity points",
     "Build": "build points",
     "Think": "thinking points",
@@ -765,41 +989,72 @@ POINT_LABEL_BY_TAG = {
     "Kindness": "kindness points",
     "Planet": "planet points",
     "Health": "health points",
-}
+})
+
+
+BALLOON_EVERY = 5
+
+
+def celebrate(counter_key: str) -> None:
+    """Toast for routine rewards; save the full balloon animation for every fifth one."""
+    count = st.session_state.get(counter_key, 0) + 1
+    st.session_state[counter_key] = count
+    if count % BALLOON_EVERY == 0:
+        st.balloons()
+    else:
+        st.toast("🎉", icon="✨")
 
 
 def celebration_for(tag: Optional[str]) -> str:
-    pool = CELEBRATION_BY_TAG.get(tag)
-    if pool:
-        return random.choice(pool)
-    return random.choice(CELEBRATION_MESSAGES)
+    pool = CELEBRATION_BY_TAG.get(tag) or CELEBRATION_MESSAGES
+    size = len(pool)
+    if size == 1:
+        return pool[0]
+    # Pools are tiny, so the modulo bias of a 32-bit draw is negligible.
+    return pool[random.getrandbits(32) % size]
 
 
-def targeted_choice(tag: str, options: List[str], counts: Dict[str, int], fallback: Optional[str] = None) -> str:
+def targeted_choice(tag: str, options: Sequence[str], counts: Dict[str, int], fallback: Optional[str] = None) -> str:
     counts = counts or {}
-    options = options or []
+    options = options or ()
     if not options:
         return ""
     today_key = datetime.date.today().isoformat()
-    if tag and counts.get(tag, 0):
-        seed = f"{tag}-{counts.get(tag)}-{today_key}"
-        rnd = random.Random(seed)
-        return rnd.choice(options)
-    if fallback and counts.get(fallback, 0):
-        seed = f"{fallback}-{counts.get(fallback)}-{today_key}"
-        rnd = random.Random(seed)
-        return rnd.choice(options)
-    return random.choice(options)
+    for key in (tag, fallback):
+        if key and counts.get(key, 0):
+            # crc32 rather than hash(): str hashing is salted per process, and the
+            # pick must stay the same across reruns and server workers for the day.
+            seed = f"{key}-{counts.get(key)}-{today_key}"
+            return options[zlib.crc32(seed.encode()) % len(options)]
+    return _choice(options)
+
+
+TAG_TO_LEGEND: Dict[str, Tuple[str, str]] = {}
+for _title, _story in LEGEND_SPOTLIGHTS:
+    if _title in LEGEND_ALIGNMENT:
+        TAG_TO_LEGEND.setdefault(LEGEND_ALIGNMENT[_title], (_title, _story))
+
+
+def scan_tag_counts(tag_counts: Dict[str, int]) -> Tuple[Optional[str], Optional[Tuple[str, str]]]:
+    """Return the top tag and the legend of the top tag that has one, in a single pass.
+
+    Ties go to the earlier tag, matching max() and a stable descending sort.
+    """
+    top_tag: Optional[str] = None
+    top_count = 0
+    legend: Optional[Tuple[str, str]] = None
+    legend_count = 0
+    for tag, count in (tag_counts or {}).items():
+        if top_tag is None or count > top_count:
+            top_tag, top_count = tag, count
+        candidate = TAG_TO_LEGEND.get(tag)
+        if candidate is not None and (legend is None or count > legend_count):
+            legend, legend_count = candidate, count
+    return top_tag, legend
 
 
 def choose_legend_story(tag_counts: Dict[str, int]) -> Tuple[str, str]:
-    if not tag_counts:
-        return random.choice(LEGEND_SPOTLIGHTS)
-    for tag, _ in sorted(tag_counts.items(), key=lambda x: x[1], reverse=True):
-        for title, story in LEGEND_SPOTLIGHTS:
-            if LEGEND_ALIGNMENT.get(title) == tag:
-                return title, story
-    return random.choice(LEGEND_SPOTLIGHTS)
+    return scan_tag_counts(tag_counts)[1] or _choice(LEGEND_SPOTLIGHTS)
 
 
 # Note: init_db() and mark_open_today() moved to after authentication in main()
@@ -807,46 +1062,85 @@ def choose_legend_story(tag_counts: Dict[str, int]) -> Tuple[str, str]:
 ensure_default_silentgpt_data()
 
 
-@lru_cache(maxsize=1)
-def _load_base_css() -> str:
-    css_path = APP_ROOT / "styles.css"
+STYLES_CSS_PATH = APP_ROOT / "styles.css"
+
+
+def _file_mtime(path: Path) -> float:
+    """Cache-key component so edited assets are re-read; 0.0 when the file is missing."""
     try:
-        return css_path.read_text()
+        return path.stat().st_mtime
+    except OSError:
+        return 0.0
+
+
+@st.cache_resource(show_spinner=False)
+def _load_base_css(mtime: float) -> str:
+    try:
+        return f"<style>{STYLES_CSS_PATH.read_text()}</style>"
     except FileNotFoundError:
         return ""
 
 
-base_css = _load_base_css()
+base_css = _load_base_css(_file_mtime(STYLES_CSS_PATH))
 if base_css:
-    st.markdown(f"<style>{base_css}</style>", unsafe_allow_html=True)
+    st.markdown(base_css, unsafe_allow_html=True)
 
-@st.cache_data(show_spinner=False)
-def _encoded_bg(image_path: str) -> str:
+@st.cache_resource(show_spinner=False)
+def _background_css(image_path: str, mtime: float) -> str:
+    """Full <style> block for a background, built once per file version and shared by reference."""
     path = Path(image_path)
-    if not path.exists():
+    if not path.is_file():
         return ""
-    return base64.b64encode(path.read_bytes()).decode()
-
-
-def add_bg(image_path: Path) -> None:
-    if not ENABLE_BACKGROUNDS:
-        return
-    encoded = _encoded_bg(str(image_path))
-    if not encoded:
-        return
-    st.markdown(
-        f"""
+    try:
+        static_name = path.relative_to(STATIC_DIR).as_posix()
+    except ValueError:
+        return ""
+    # Served by Streamlit's static route so the browser caches it; mtime busts that cache on edits
+    return f"""
         <style>
         .stApp {{
-            background-image: url('data:image/jpg;base64,{encoded}');
+            background-image: url('app/static/{quote(static_name)}?v={int(mtime)}');
             background-size: cover;
             background-attachment: fixed;
             background-position: center;
         }}
         </style>
-        """,
-        unsafe_allow_html=True,
-    )
+        """
+
+
+if ENABLE_BACKGROUNDS:
+    def add_bg(image_path: Path) -> None:
+        css = _background_css(str(image_path), _file_mtime(image_path))
+        if css:
+            st.markdown(css, unsafe_allow_html=True)
+else:
+    # Decided once per run: with backgrounds off no image is ever stat'ed or read.
+    def add_bg(image_path: Path) -> None:
+        return None
+
+
+_rng = random.Random()
+DAILY_CARD_KEYS = ("greeting", "mission", "health_tip", "kindness", "earth_tip", "legend", "inspiration")
+DAILY_POOLS = (
+    GREETINGS,
+    MISSIONS,
+    HEALTH_TIPS,
+    KINDNESS_CHALLENGES,
+    EARTH_PROMISES,
+    LEGEND_SPOTLIGHTS,
+    INSPIRATION_SNIPPETS,
+)
+
+
+def _pick_daily(rnd: random.Random) -> List[object]:
+    choice = rnd.choice
+    return [choice(pool) for pool in DAILY_POOLS]
+
+
+@st.cache_data(ttl=86400, show_spinner=False)
+def daily_picks(day_iso: str) -> Dict[str, object]:
+    """Deterministic card set for a given day, shared by every session that day."""
+    return dict(zip(DAILY_CARD_KEYS, _pick_daily(random.Random(day_iso))))
 
 
 def initialize_state() -> None:
@@ -854,39 +1148,44 @@ def initialize_state() -> None:
         st.session_state.history = [{"role": "system", "content": SYSTEM_PROMPT}]
     st.session_state.setdefault("mode", MODE_OPTIONS[0][0])
     st.session_state.setdefault("missions_completed", 0)
-    st.session_state.setdefault("greeting", random.choice(GREETINGS))
-    st.session_state.setdefault("mission", random.choice(MISSIONS))
-    st.session_state.setdefault("health_tip", random.choice(HEALTH_TIPS))
-    st.session_state.setdefault("kindness", random.choice(KINDNESS_CHALLENGES))
-    st.session_state.setdefault("earth_tip", random.choice(EARTH_PROMISES))
-    st.session_state.setdefault("legend", random.choice(LEGEND_SPOTLIGHTS))
-    st.session_state.setdefault("inspiration", random.choice(INSPIRATION_SNIPPETS))
+    if any(key not in st.session_state for key in DAILY_CARD_KEYS):
+        for key, value in daily_picks(datetime.date.today().isoformat()).items():
+            st.session_state.setdefault(key, value)
     st.session_state.setdefault("last_saved_diary", "")
 
 
 def refresh_daily_cards() -> None:
-    st.session_state.greeting = random.choice(GREETINGS)
-    st.session_state.mission = random.choice(MISSIONS)
-    st.session_state.health_tip = random.choice(HEALTH_TIPS)
-    st.session_state.kindness = random.choice(KINDNESS_CHALLENGES)
-    st.session_state.earth_tip = random.choice(EARTH_PROMISES)
-    st.session_state.legend = random.choice(LEGEND_SPOTLIGHTS)
-    st.session_state.inspiration = random.choice(INSPIRATION_SNIPPETS)
+    for key, value in zip(DAILY_CARD_KEYS, _pick_daily(_rng)):
+        st.session_state[key] = value
+
+
+_BADGE_THRESHOLDS = tuple(threshold for threshold, _ in ACHIEVEMENT_BADGES)
+_BADGE_LABELS = tuple(label for _, label in ACHIEVEMENT_BADGES)
 
 
-def badge_list(points: int) -> List[str]:
-    return [label for threshold, label in ACHIEVEMENT_BADGES if points >= threshold]
+def badge_list(points: int) -> Tuple[str, ...]:
+    # Thresholds ascend, so the unlocked badges are always a prefix of the labels.
+    return _BADGE_LABELS[:bisect_right(_BADGE_THRESHOLDS, points)]
 
 
 def diary_summary_from_history(history: List[dict]) -> Dict[str, str]:
-    user_msgs = [msg["content"] for msg in history if msg["role"] == "user"]
-    coach_msgs = [msg["content"] for msg in history if msg["role"] == "assistant"]
+    # Only the first three user turns and the last coach turn are used, so scan
+    # from each end and stop as soon as those are found
+    user_turns: List[str] = []
+    for msg in history:
+        if msg["role"] == "user":
+            user_turns.append(msg["content"])
+            if len(user_turns) == 3:
+                break
+    first_user = user_turns[0] if user_turns else ""
+    tried = user_turns[1:]
+    last_coach = next((msg["content"] for msg in reversed(history) if msg["role"] == "assistant"), "")
     summary = {
-        "big_question": user_msgs[0] if user_msgs else "",
-        "what_we_tried": "\n\n".join(user_msgs[1:3]) if len(user_msgs) > 1 else "",
-        "what_we_found": coach_msgs[-1] if coach_msgs else "",
+        "big_question": first_user,
+        "what_we_tried": "\n\n".join(tried),
+        "what_we_found": last_coach,
         "how_ai_might_be_wrong": "",
-        "next_step": coach_msgs[-1] if coach_msgs else "",
+        "next_step": last_coach,
         "gratitude": "",
         "kindness_act": "",
         "planet_act": "",
@@ -899,8 +1198,11 @@ def save_diary_entry() -> Optional[Path]:
         return None
     timestamp = datetime.datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     diary_file = DIARY_DIR / f"diary_{timestamp}.json"
-    with diary_file.open("w", encoding="utf-8") as handle:
-        json.dump(st.session_state.history, handle, indent=2)
+    if orjson is not None:
+        diary_file.write_bytes(orjson.dumps(st.session_state.history, option=orjson.OPT_INDENT_2))
+    else:
+        with diary_file.open("w", encoding="utf-8") as handle:
+            json.dump(st.session_state.history, handle, indent=2, ensure_ascii=False)
     summary = diary_summary_from_history(st.session_state.history)
     save_diary(datetime.date.today().isoformat(), summary)
     st.session_state.last_saved_diary = diary_file.name
@@ -925,137 +1227,137 @@ def transcribe_audio(audio_bytes: bytes, client: OpenAI) -> Optional[str]:
 
 
 def render_sidebar() -> None:
-    st.sidebar.markdown("## 🧭 Your Journey")
-    profile = st.session_state.get("supabase_profile")
+    state = st.session_state
+    sidebar = st.sidebar
+    sidebar.markdown("## 🧭 Your Journey")
+    profile = state.get("supabase_profile")
     if profile:
         display_label = profile.get("display_name")
         hero_dream = profile.get("hero_dream")
         if display_label:
-            st.sidebar.markdown(f"### {escape(display_label)}")
+            sidebar.markdown(f"### {escape(display_label)}")
         else:
-            st.sidebar.caption("Set your hero name to personalize the coach.")
+            sidebar.caption("Set your hero name to personalize the coach.")
         if hero_dream:
-            st.sidebar.caption(f"⭐ Dream: {escape(hero_dream)}")
+            sidebar.caption(f"⭐ Dream: {escape(hero_dream)}")
         status = (profile.get("subscription_status") or "unknown").title()
         trial_end = parse_timestamp(profile.get("trial_ends_at"))
         badge = f"Status: **{status}**"
         if trial_end:
             badge += f" • Trial ends {trial_end.date().isoformat()}"
-        st.sidebar.info(badge)
-        if st.sidebar.button("Sign out"):
+        sidebar.info(badge)
+        if sidebar.button("Sign out"):
             supabase_logout()
 
-    points = total_points()
+    points = cached_total_points()
     streak = streak_days()
     tag_counts = cached_recent_tags()
-    st.session_state["tag_counts"] = tag_counts
+    state["tag_counts"] = tag_counts
 
-    col_points, col_streak = st.sidebar.columns(2)
+    col_points, col_streak = sidebar.columns(2)
     with col_points:
         st.metric("🏆 Points", points)
     with col_streak:
         st.metric("🔥 Streak", streak)
     total_profiles = fetch_total_profiles()
     if total_profiles is not None:
-        st.sidebar.metric("👪 Parent accounts", total_profiles)
+        sidebar.metric("👪 Parent accounts", total_profiles)
     if profile and profile.get("stripe_customer_id"):
-        if st.sidebar.button("Manage subscription", use_container_width=True, key="sidebar-manage-subscription"):
+        if sidebar.button("Manage subscription", use_container_width=True, key="sidebar-manage-subscription"):
             result = invoke_supabase_function(
                 "create-portal-session",
-                {"supabase_user_id": st.session_state.get("supabase_session", {}).get("user_id")},
+                {"supabase_user_id": state.get("supabase_session", {}).get("user_id")},
             )
             if result and result.get("url"):
-                st.session_state["portal_url"] = result["url"]
+                state["portal_url"] = result["url"]
                 st.rerun()
             else:
-                st.sidebar.error("Unable to open customer portal right now.")
+                sidebar.error("Unable to open customer portal right now.")
 
     badges = badge_list(points)
     if badges:
         badges_text = " ".join(f"🏅 {badge}" for badge in badges)
-        st.sidebar.markdown(f"**Unlocked Badges:** {badges_text}")
+        sidebar.markdown(f"**Unlocked Badges:** {badges_text}")
     else:
-        st.sidebar.caption("Collect curiosity points to unlock badges!")
+        sidebar.caption("Collect curiosity points to unlock badges!")
 
-    st.sidebar.markdown("### 🎯 Ritual Rewards")
-    if st.sidebar.button("🕒 We completed our 21-minute ritual", use_container_width=True):
+    sidebar.markdown("### 🎯 Ritual Rewards")
+    if sidebar.button("🕒 We completed our 21-minute ritual", use_container_width=True):
         today = datetime.date.today().isoformat()
         log_mission(today, "Ritual", "21-minute Silent Room ritual")
         add_points(15, "ritual_chat")
         invalidate_progress_caches()
         label = POINT_LABEL_BY_TAG.get("Curiosity", "points")
         message = celebration_for("Curiosity")
-        st.sidebar.success(f"{message} (+15 {label}!)")
-        st.balloons()
-        st.sidebar.caption("Great job! Come back tomorrow for more points.")
-    if st.sidebar.button("🤝 I did a Kindness Act", use_container_width=True):
+        sidebar.success(f"{message} (+15 {label}!)")
+        celebrate("ritual_count")
+        sidebar.caption("Great job! Come back tomorrow for more points.")
+    if sidebar.button("🤝 I did a Kindness Act", use_container_width=True):
         add_points(5, "kindness_act")
         invalidate_progress_caches()
         message = celebration_for("Kindness")
         label = POINT_LABEL_BY_TAG.get("Kindness", "points")
-        st.sidebar.success(f"{message} (+5 {label}!)")
-        st.balloons()
-    if st.sidebar.button("🌍 I did a Planet Act", use_container_width=True):
+        sidebar.success(f"{message} (+5 {label}!)")
+        celebrate("kindness_count")
+    if sidebar.button("🌍 I did a Planet Act", use_container_width=True):
         add_points(5, "planet_act")
         invalidate_progress_caches()
         message = celebration_for("Planet")
         label = POINT_LABEL_BY_TAG.get("Planet", "points")
-        st.sidebar.success(f"{message} (+5 {label}!)")
-        st.balloons()
+        sidebar.success(f"{message} (+5 {label}!)")
+        celebrate("planet_count")
 
-    if st.sidebar.button("💾 Save to Discovery Diary", use_container_width=True):
+    if sidebar.button("💾 Save to Discovery Diary", use_container_width=True):
         saved = save_diary_entry()
         if saved:
-            st.sidebar.success(f"Saved insights to {saved.name}")
+            sidebar.success(f"Saved insights to {saved.name}")
         else:
-            st.sidebar.warning("Chat with your coach before saving a diary entry.")
+            sidebar.warning("Chat with your coach before saving a diary entry.")
 
-    st.sidebar.divider()
-    top_tag = None
-    if tag_counts:
-        top_tag = max(tag_counts.items(), key=lambda x: x[1])[0]
+    sidebar.divider()
+    top_tag, legend = scan_tag_counts(tag_counts)
     if top_tag not in TAGGED_INSPIRATIONS:
         top_tag = "Curiosity"
-    st.session_state.setdefault("inspiration_tag", top_tag)
-    if st.session_state.get("inspiration_tag") != top_tag:
-        st.session_state["inspiration_tag"] = top_tag
-        st.session_state["inspiration"] = targeted_choice(
+    state.setdefault("inspiration_tag", top_tag)
+    if state.get("inspiration_tag") != top_tag:
+        state["inspiration_tag"] = top_tag
+        state["inspiration"] = targeted_choice(
             top_tag,
             TAGGED_INSPIRATIONS.get(top_tag, INSPIRATION_SNIPPETS),
             tag_counts,
         )
 
-    legend_title, legend_story = choose_legend_story(tag_counts)
-    st.session_state.legend = (legend_title, legend_story)
-    st.sidebar.markdown("## 🪷 Wisdom Spotlight")
-    st.sidebar.markdown(f"**{legend_title}**")
-    st.sidebar.write(legend_story)
+    legend_title, legend_story = legend or _choice(LEGEND_SPOTLIGHTS)
+    state.legend = (legend_title, legend_story)
+    sidebar.markdown("## 🪷 Wisdom Spotlight")
+    sidebar.markdown(f"**{legend_title}**")
+    sidebar.write(legend_story)
 
-    if st.sidebar.button("🧹 Start fresh chat", use_container_width=True):
+    if sidebar.button("🧹 Start fresh chat", use_container_width=True):
         reset_conversation()
         st.rerun()
 
 
 def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: Optional[str]) -> None:
+    state = st.session_state
     add_bg(BACKGROUND_IMAGES.get("coach", Path()))
 
     st.markdown('<div class="section-heading">🤖 SilenceGPT — The Nobel Coach</div>', unsafe_allow_html=True)
     st.caption("A calm ritual: choose your explorer, pick an adventure, chat, then act.")
 
     silence_api_key = (
-        st.secrets.get("SILENCE_GPT_API_KEY")
+        get_config("SILENCE_GPT_API_KEY", prefer_secrets=True)
         or default_api_key
-        or os.getenv("SILENCE_GPT_API_KEY")
-        or os.getenv("OPENAI_API_KEY")
+        or get_config("OPENAI_API_KEY", prefer_secrets=True)
     )
 
     # session keys
     child_key = "silence_child_id"
     project_key = "silence_project_id"
     thread_key = "silence_thread_id"
-    free_limit = st.session_state.get("free_tier_limit", FREE_TIER_DAILY_MESSAGES)
-    is_paid = st.session_state.get("has_paid_access", False)
-    profile = profile or st.session_state.get("supabase_profile")
+    free_limit = state.get("free_tier_limit", FREE_TIER_DAILY_MESSAGES)
+    is_paid = state.get("has_paid_access", False)
+    profile = profile or state.get("supabase_profile")
 
     def step_indicator(current: int) -> None:
         labels = ["1. Explorer", "2. Adventure", "3. Chat"]
@@ -1080,22 +1382,22 @@ def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: O
                     new_child_interests.strip(),
                     new_child_dream.strip(),
                 )
-                cached_child_profiles.clear()
-                st.session_state[child_key] = child_id
-                st.session_state.pop(project_key, None)
-                st.session_state.pop(thread_key, None)
+                invalidate_coach_caches("children")
+                state[child_key] = child_id
+                state.pop(project_key, None)
+                state.pop(thread_key, None)
                 st.success("Explorer ready!")
                 st.rerun()
             else:
                 st.warning("Please add a name.")
 
-    selected_child_id = st.session_state.get(child_key)
+    selected_child_id = state.get(child_key)
     child_ids = {child["id"] for child in children}
     if children and (selected_child_id not in child_ids):
-        st.session_state[child_key] = children[0]["id"]
+        state[child_key] = children[0]["id"]
         st.rerun()
 
-    selected_project_id = st.session_state.get(project_key)
+    selected_project_id = state.get(project_key)
 
     stage = 1
     if selected_child_id:
@@ -1110,15 +1412,15 @@ def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: O
         return
 
     # Ensure a selected explorer if one exists
-    if st.session_state.get(child_key) is None and children:
-        st.session_state[child_key] = children[0]["id"]
+    if state.get(child_key) is None and children:
+        state[child_key] = children[0]["id"]
 
     st.markdown("### Choose your explorer")
     cols = st.columns(min(len(children), 3))
     for idx, child in enumerate(children):
         column = cols[idx % len(cols)]
         with column:
-            active = child["id"] == st.session_state[child_key]
+            active = child["id"] == state[child_key]
             card = st.container(border=True)
             with card:
                 st.markdown(f"#### {'🌟' if active else '🙂'} {child['name']}")
@@ -1131,9 +1433,9 @@ def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: O
                         disabled=active,
                         use_container_width=True,
                     ):
-                        st.session_state[child_key] = child["id"]
-                        st.session_state.pop(project_key, None)
-                        st.session_state.pop(thread_key, None)
+                        state[child_key] = child["id"]
+                        state.pop(project_key, None)
+                        state.pop(thread_key, None)
                         st.rerun()
                 with btn_cols[1]:
                     if st.button(
@@ -1143,25 +1445,26 @@ def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: O
                         use_container_width=True,
                     ):
                         delete_child_profile(child["id"])
-                        if st.session_state.get(child_key) == child["id"]:
-                            st.session_state.pop(child_key, None)
-                            st.session_state.pop(project_key, None)
-                            st.session_state.pop(thread_key, None)
-                        cached_child_profiles.clear()
-                        cached_projects.clear()
-                        cached_threads.clear()
-                        cached_thread_messages.clear()
+                        if state.get(child_key) == child["id"]:
+                            state.pop(child_key, None)
+                            state.pop(project_key, None)
+                            state.pop(thread_key, None)
+                        invalidate_coach_caches()
                         st.success(f"Removed explorer {child['name']}.")
                         st.rerun()
 
-    selected_child = get_child_profile(st.session_state[child_key])
+    # The explorer list above already carries every field the tab uses
+    selected_child = next(
+        (child for child in children if child["id"] == state[child_key]), None
+    ) or cached_child_profile(state[child_key])
     if not selected_child:
         st.warning("Explorer missing. Please add one again.")
         return
 
     # Step 2: adventures (projects)
     try:
-        adventures = cached_projects(child_id=st.session_state[child_key])
+        child_ids = tuple(child["id"] for child in children)
+        adventures = cached_projects_bulk(child_ids).get(state[child_key], [])
     except Exception as e:
         st.error(f"❌ **Snowflake Error**: Cannot load adventures. {type(e).__name__}: {str(e)}")
         st.info("💡 Check Snowflake credentials in secrets and ensure tables exist.")
@@ -1180,14 +1483,14 @@ def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: O
                 if adventure_name.strip():
                     try:
                         project_id = create_project(
-                            st.session_state[child_key],
+                            state[child_key],
                             adventure_name.strip(),
                             adventure_goal.strip(),
                             adventure_tags.strip(),
                         )
-                        cached_projects.clear()
-                        st.session_state[project_key] = project_id
-                        st.session_state.pop(thread_key, None)
+                        invalidate_coach_caches("projects")
+                        state[project_key] = project_id
+                        state.pop(thread_key, None)
                         st.success("Adventure ready. Time to chat!")
                         st.rerun()
                     except Exception as e:
@@ -1197,26 +1500,26 @@ def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: O
                     st.warning("Adventure name required.")
         return
 
-    if project_key not in st.session_state or st.session_state[project_key] not in {proj["id"] for proj in adventures}:
-        st.session_state[project_key] = adventures[0]["id"]
+    if project_key not in state or state[project_key] not in {proj["id"] for proj in adventures}:
+        state[project_key] = adventures[0]["id"]
         st.rerun()
     st.markdown("### Pick tonight's adventure")
     adventure_cols = st.columns(min(len(adventures), 3))
     for idx, proj in enumerate(adventures):
         column = adventure_cols[idx % len(adventure_cols)]
         with column:
-            active = proj["id"] == st.session_state[project_key]
+            active = proj["id"] == state[project_key]
             card = st.container(border=True)
             with card:
                 st.markdown(f"#### {'🚀' if active else '🗂️'} {proj['name']}")
                 st.caption(proj["goal"] or "Set a mission goal")
-                tags = ", ".join(tag.strip() for tag in (proj["tags"] or "").split(",") if tag.strip())
+                tags = ", ".join(proj.get("tag_list") or ())
                 if tags:
                     st.caption(f"Tags: {tags}")
                 choose_label = "Open adventure" if not active else "Currently active"
                 if st.button(choose_label, key=f"pick_project_{proj['id']}", disabled=active, use_container_width=True):
-                    st.session_state[project_key] = proj["id"]
-                    st.session_state.pop(thread_key, None)
+                    state[project_key] = proj["id"]
+                    state.pop(thread_key, None)
                     st.rerun()
 
     with st.expander("➕ Add another adventure", expanded=False):
@@ -1229,20 +1532,20 @@ def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: O
             if submitted_extra:
                 if extra_name.strip():
                     new_project_id = create_project(
-                        st.session_state[child_key],
+                        state[child_key],
                         extra_name.strip(),
                         extra_goal.strip(),
                         extra_tags.strip(),
                     )
-                    cached_projects.clear()
-                    st.session_state[project_key] = new_project_id
-                    st.session_state.pop(thread_key, None)
+                    invalidate_coach_caches("projects")
+                    state[project_key] = new_project_id
+                    state.pop(thread_key, None)
                     st.success("Adventure added.")
                     st.rerun()
                 else:
                     st.warning("Adventure name required.")
 
-    selected_project = get_project(st.session_state[project_key])
+    selected_project = cached_project(state[project_key])
     if not selected_project:
         st.warning("Adventure could not be loaded.")
         return
@@ -1255,18 +1558,14 @@ def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: O
             if new_name.strip() != selected_project["name"]:
                 rename_project(selected_project["id"], new_name.strip())
             update_project_details(selected_project["id"], new_goal.strip(), new_tags.strip())
-            cached_projects.clear()
-            cached_threads.clear()
-            cached_thread_messages.clear()
+            invalidate_coach_caches("projects", "threads", "messages")
             st.success("Adventure updated.")
             st.rerun()
         if st.button("Archive this adventure", key="archive_active_adventure"):
             archive_project(selected_project["id"], 1)
-            st.session_state.pop(project_key, None)
-            st.session_state.pop(thread_key, None)
-            cached_projects.clear()
-            cached_threads.clear()
-            cached_thread_messages.clear()
+            state.pop(project_key, None)
+            state.pop(thread_key, None)
+            invalidate_coach_caches("projects", "threads", "messages")
             st.info("Adventure archived. Start a new one when ready.")
             st.rerun()
 
@@ -1274,27 +1573,25 @@ def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: O
     st.markdown("### 3. Chat with SilenceGPT")
 
     threads = cached_threads(selected_project["id"])
-    if thread_key not in st.session_state or (st.session_state.get(thread_key) and st.session_state[thread_key] not in {thr["id"] for thr in threads}):
-        st.session_state.pop(thread_key, None)
+    if thread_key not in state or (state.get(thread_key) and state[thread_key] not in {thr["id"] for thr in threads}):
+        state.pop(thread_key, None)
 
     if st.button("➕ New page in notebook", key="new_thread_btn"):
         new_tid = create_thread(selected_project["id"], "New page")
-        cached_threads.clear()
-        cached_thread_messages.clear()
-        st.session_state[thread_key] = new_tid
+        invalidate_threads_for(selected_project["id"])
+        state[thread_key] = new_tid
         st.rerun()
 
     if not threads:
         new_tid = create_thread(selected_project["id"], "First page")
-        cached_threads.clear()
-        cached_thread_messages.clear()
+        invalidate_threads_for(selected_project["id"])
         threads = cached_threads(selected_project["id"])
-        st.session_state[thread_key] = new_tid
+        state[thread_key] = new_tid
 
-    if st.session_state.get(thread_key) is None and threads:
-        st.session_state[thread_key] = threads[0]["id"]
+    if state.get(thread_key) is None and threads:
+        state[thread_key] = threads[0]["id"]
 
-    current_thread_id = st.session_state.get(thread_key)
+    current_thread_id = state.get(thread_key)
     if current_thread_id is None:
         st.info("Tap “New page in notebook” to begin.")
         return
@@ -1309,23 +1606,25 @@ def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: O
             active = tid == current_thread_id
             label = f"**{'➡️' if active else '🗂️'} {title}**"
             if st.button(label, key=f"jump_thread_{tid}", use_container_width=True, disabled=active):
-                st.session_state[thread_key] = tid
+                state[thread_key] = tid
                 st.rerun()
             with st.expander("Options", expanded=False):
                 new_name = st.text_input("Rename page", value=title, key=f"rename_thread_{tid}")
                 if st.button("Rename page", key=f"rename_btn_{tid}"):
                     rename_thread(tid, new_name or "Notebook page")
+                    invalidate_threads_for(selected_project["id"])
                     st.rerun()
                 if st.button("Archive page", key=f"archive_btn_{tid}"):
                     archive_thread(tid, 1)
-                    if st.session_state.get(thread_key) == tid:
-                        st.session_state.pop(thread_key, None)
+                    invalidate_threads_for(selected_project["id"])
+                    if state.get(thread_key) == tid:
+                        state.pop(thread_key, None)
                     st.rerun()
 
         with st.expander("🔍 Find a memory", expanded=False):
             search_query = st.text_input("Search all pages", placeholder="e.g., volcano OR kindness", key="silence_search")
             if search_query.strip():
-                hits = search_messages(st.session_state[child_key], search_query.strip())
+                hits = search_messages(state[child_key], search_query.strip())
                 if hits:
                     for hit in hits[:6]:
                         st.caption(f"Page #{hit['thread_id']} · {hit['snippet']}")
@@ -1364,13 +1663,14 @@ def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: O
             usage = get_free_tier_usage()
             if usage["count"] >= free_limit:
                 st.warning("Free Explorer limit reached for today. Upgrade to continue chatting.")
-                render_subscription_cta(profile, st.session_state.get("checkout_status"))
+                render_subscription_cta(profile, state.get("checkout_status"))
                 prompt = None
             else:
                 usage["count"] += 1
         if prompt:
-            add_message(current_thread_id, "user", prompt.strip(), model="gpt-4.1-mini")
-            cached_thread_messages.clear()
+            prompt = prompt.strip()
+            add_message(current_thread_id, "user", prompt, model="gpt-4.1-mini")
+            invalidate_messages_for(current_thread_id)
             system_prompt = (
                 selected_project["system_prompt"]
                 or build_system_prompt(
@@ -1382,22 +1682,36 @@ def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: O
                     selected_project["tags"],
                 )
             )
+            # msgs was loaded above this run; add the new prompt instead of re-reading the thread
             history = [{"role": "system", "content": system_prompt}]
-            for entry in cached_thread_messages(current_thread_id):
-                history.append({"role": entry["role"], "content": entry["content"]})
-            try:
-                reply = chat_completion(
-                    history,
-                    api_key=silence_api_key,
-                    model="gpt-4.1-mini",
-                    temperature=0.7,
-                )
-            except Exception as exc:
-                st.error(f"Model error: {exc}")
-            else:
+            history.extend({"role": entry["role"], "content": entry["content"]} for entry in msgs)
+            history.append({"role": "user", "content": prompt})
+            with chat_container:
+                with st.chat_message("user", avatar="🙂"):
+                    st.markdown(prompt)
+                try:
+                    # Render tokens as they arrive; the full reply is saved once the stream ends
+                    with st.chat_message("assistant", avatar="🧠"):
+                        reply = st.write_stream(
+                            chat_completion_stream(
+                                history,
+                                api_key=silence_api_key,
+                                model="gpt-4.1-mini",
+                                temperature=0.7,
+                            )
+                        )
+                except Exception as exc:
+                    reply = None
+                    st.error(f"Model error: {exc}")
+            if reply:
                 add_message(current_thread_id, "assistant", reply, model="gpt-4.1-mini")
-                cached_thread_messages.clear()
-                st.rerun()
+                invalidate_messages_for(current_thread_id)
+                # Both turns are already on screen; extend msgs for the mission helper instead of rerunning the page
+                msgs = [
+                    *msgs,
+                    {"role": "user", "content": prompt},
+                    {"role": "assistant", "content": reply},
+                ]
 
         with st.expander("✨ Turn this into a mission", expanded=False):
             if msgs:
@@ -1412,10 +1726,35 @@ def render_coach_tab(client: OpenAI, profile: Optional[dict], default_api_key: O
 
 
 @st.cache_data(ttl=30, show_spinner=False)
-def cached_feed() -> List[Dict[str, str]]:
+def _cached_feed_version():
+    return feed_version()
+
+
+# The version marker cannot see edits to existing posts, so the TTL still bounds staleness
+@st.cache_data(ttl=600, show_spinner=False, max_entries=4)
+def _feed_at_version(version) -> List[Dict[str, str]]:
+    return load_feed()
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def _feed_unversioned() -> List[Dict[str, str]]:
     return load_feed()
 
 
+def cached_feed() -> List[Dict[str, str]]:
+    """Posts, re-read only when the feed's count or newest timestamp changes."""
+    version = _cached_feed_version()
+    if version is None:
+        # Version query failed; keep the previous 30s cache rather than loading every rerun
+        return _feed_unversioned()
+    return _feed_at_version(version)
+
+
+def invalidate_feed() -> None:
+    _cached_feed_version.clear()
+    _feed_unversioned.clear()
+
+
 def render_mission_week() -> None:
     week = cached_week_summary(7)
     if not week:
@@ -1466,11 +1805,7 @@ def ensure_app_initialized() -> None:
     st.session_state["just_logged_in"] = True
 
 
-def render_knowledge_hub() -> None:
-    add_bg(BACKGROUND_IMAGES.get("gallery", Path()))
-    st.markdown('<div class="section-heading">📚 Knowledge Hub</div>', unsafe_allow_html=True)
-    st.markdown(
-        """
+_KNOWLEDGE_HUB_CSS = """
 <style>
 .share-row {
   display: flex;
@@ -1509,16 +1844,40 @@ def render_knowledge_hub() -> None:
   padding-left: 0.6rem;
 }
 </style>
-""",
-        unsafe_allow_html=True,
-    )
-    feed = cached_feed()
-    query_params = st.query_params
-    target_slug = query_params.get("post")
-    if isinstance(target_slug, list):
-        target_slug = target_slug[0]
-    configured_base = st.secrets.get("APP_BASE_URL", os.getenv("APP_BASE_URL", "")).strip()
-    share_base = st.secrets.get("SHARE_APP_BASE_URL", os.getenv("SHARE_APP_BASE_URL", "")).strip()
+"""
+
+
+@st.cache_data(show_spinner=False, max_entries=512)
+def _share_icons_html(title: str, share_url: str) -> str:
+    """Share row markup for one post; depends only on its title and link, so it is built once."""
+    share_text = f"{title} — check this Silent Room update: {share_url}"
+    encoded = quote_plus(share_text)
+    whatsapp = f"https://wa.me/?text={encoded}"
+    twitter = f"https://twitter.com/intent/tweet?text={encoded}"
+    instagram_hint = "https://www.instagram.com/create/story/"
+    safe_share_url = escape(share_url, quote=True)
+    return f"""
+<div class="share-row">
+  <input type="text" value="{safe_share_url}" readonly class="share-link" />
+  <a class="share-icon" href="{safe_share_url}" target="_blank" title="Open post link" rel="noopener">🔗</a>
+  <a class="share-icon" href="{escape(whatsapp, quote=True)}" target="_blank" title="Share on WhatsApp" rel="noopener">
+    <img src="https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/whatsapp.svg" alt="WhatsApp" />
+  </a>
+  <a class="share-icon" href="{escape(twitter, quote=True)}" target="_blank" title="Share on X" rel="noopener">
+    <img src="https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/x.svg" alt="X" />
+  </a>
+  <a class="share-icon" href="{escape(instagram_hint, quote=True)}" target="_blank" title="Post on Instagram" rel="noopener">
+    <img src="https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/instagram.svg" alt="Instagram" />
+  </a>
+</div>
+"""
+
+
+@st.cache_resource(show_spinner=False)
+def _share_base_urls() -> Tuple[str, str, bool]:
+    """(app base URL, share base URL, whether the app base was guessed); fixed for the process."""
+    configured_base = (get_config("APP_BASE_URL", "", prefer_secrets=True) or "").strip()
+    share_base = (get_config("SHARE_APP_BASE_URL", "", prefer_secrets=True) or "").strip()
     configured_base = configured_base.rstrip("/") if configured_base else ""
     share_base = share_base.rstrip("/") if share_base else ""
     fallback_base = ""
@@ -1538,6 +1897,19 @@ def render_knowledge_hub() -> None:
         fallback_base = fallback_base.rstrip("/")
     app_base_url = configured_base or fallback_base
     base_was_guessed = bool(not configured_base and app_base_url)
+    return app_base_url, share_base, base_was_guessed
+
+
+def render_knowledge_hub() -> None:
+    add_bg(BACKGROUND_IMAGES.get("gallery", Path()))
+    st.markdown('<div class="section-heading">📚 Knowledge Hub</div>', unsafe_allow_html=True)
+    st.markdown(_KNOWLEDGE_HUB_CSS, unsafe_allow_html=True)
+    feed = cached_feed()
+    query_params = st.query_params
+    target_slug = query_params.get("post")
+    if isinstance(target_slug, list):
+        target_slug = target_slug[0]
+    app_base_url, share_base, base_was_guessed = _share_base_urls()
     if base_was_guessed:
         st.caption(
             "Sharing links use your current host address. Set APP_BASE_URL in secrets for a fixed public URL."
@@ -1565,10 +1937,10 @@ def render_knowledge_hub() -> None:
                 image_urls: List[str] = []
                 if uploaded_images:
                     with st.spinner("Uploading images to Supabase…"):
-                        for uploaded in uploaded_images:
-                            url = upload_hub_media(uploaded)
-                            if url:
-                                image_urls.append(url)
+                        # Uploads are network-bound, so run up to four at once; map keeps the order
+                        upload = partial(_upload_hub_file, get_supabase_admin_client())
+                        with ThreadPoolExecutor(max_workers=4) as pool:
+                            image_urls = [url for url in pool.map(upload, uploaded_images) if url]
                 add_feed_entry(
                     title=title_text,
                     summary="",
@@ -1579,7 +1951,7 @@ def render_knowledge_hub() -> None:
                     resource_link=(resource_link or "").strip(),
                     image_urls=image_urls,
                 )
-                cached_feed.clear()
+                invalidate_feed()
                 st.success("Shared with the community.")
                 st.session_state["active_tab"] = "Knowledge Hub"
                 st.rerun()
@@ -1607,11 +1979,14 @@ def render_knowledge_hub() -> None:
                 st.success("You’re viewing the shared post.")
             if image_urls:
                 st.image(image_urls[0], use_container_width=True)
-            st.markdown(f"### {post['title']}")
+            # Title and body go out as one markdown element rather than two
+            post_md = [f"### {escape(post['title'])}"]
             body_text = post.get("body") or post.get("summary") or ""
             if body_text:
-                st.markdown(body_text, unsafe_allow_html=True)
+                post_md.append(body_text)
+            st.markdown("\n\n".join(post_md), unsafe_allow_html=True)
             if resource_link:
+                # User-entered URL: keep it out of the unsafe_allow_html element
                 st.markdown(f"[🔗 Read more]({resource_link})")
             if len(image_urls) > 1:
                 with st.expander(f"See all {len(image_urls)} images"):
@@ -1622,32 +1997,11 @@ def render_knowledge_hub() -> None:
             action_cols = st.columns([3, 1])
             with action_cols[0]:
                 if share_url:
-                    share_text = f"{post['title']} — check this Silent Room update: {share_url}"
-                    encoded = quote_plus(share_text)
-                    whatsapp = f"https://wa.me/?text={encoded}"
-                    twitter = f"https://twitter.com/intent/tweet?text={encoded}"
-                    instagram_hint = "https://www.instagram.com/create/story/"
-                    safe_share_url = escape(share_url, quote=True)
-                    icons_html = f"""
-<div class="share-row">
-  <input type="text" value="{safe_share_url}" readonly class="share-link" />
-  <a class="share-icon" href="{safe_share_url}" target="_blank" title="Open post link" rel="noopener">🔗</a>
-  <a class="share-icon" href="{escape(whatsapp, quote=True)}" target="_blank" title="Share on WhatsApp" rel="noopener">
-    <img src="https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/whatsapp.svg" alt="WhatsApp" />
-  </a>
-  <a class="share-icon" href="{escape(twitter, quote=True)}" target="_blank" title="Share on X" rel="noopener">
-    <img src="https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/x.svg" alt="X" />
-  </a>
-  <a class="share-icon" href="{escape(instagram_hint, quote=True)}" target="_blank" title="Post on Instagram" rel="noopener">
-    <img src="https://cdn.jsdelivr.net/npm/simple-icons@v9/icons/instagram.svg" alt="Instagram" />
-  </a>
-</div>
-"""
-                    st.markdown(icons_html, unsafe_allow_html=True)
+                    st.markdown(_share_icons_html(post["title"], share_url), unsafe_allow_html=True)
             with action_cols[1]:
                 if st.button("🗑️ Delete", key=f"delete_post_{post['slug']}", type="secondary", use_container_width=True):
                     delete_feed_entry(post["slug"])
-                    cached_feed.clear()
+                    invalidate_feed()
                     st.success("Post removed.")
                     st.rerun()
         st.divider()
@@ -1687,7 +2041,7 @@ def render_learning_lab_tab(api_key: Optional[str]) -> None:
             if not api_key:
                 st.error("Add OPENAI_API_KEY to secrets before generating guidance.")
                 st.stop()
-            client = OpenAI(api_key=api_key)
+            client = get_openai_client(api_key)
             system_prompt = (
                 "You are SilenceGPT, the Nobel Coach: calm, wise, and playful. "
                 f"Audience: a kid aged {kid_age} and their parent. "
@@ -1777,8 +2131,6 @@ def main() -> None:
     if not st.session_state.get("app_initialized"):
         with st.spinner("Waking up The Silent Room…"):
             ensure_app_initialized()
-    else:
-        ensure_app_initialized()
 
     checkout_status = handle_checkout_redirect()
     ensure_supabase_access()
@@ -1791,18 +2143,17 @@ def main() -> None:
     profile = st.session_state.get("supabase_profile")
     render_checkout_notice(checkout_status, profile)
     render_sidebar()
-    ensure_app_initialized()
     if st.session_state.pop("just_logged_in", False):
         st.rerun()
     portal_url = st.session_state.pop("portal_url", None)
     if portal_url:
         st.success("Opening customer portal…")
         st.markdown(
-            f'<meta http-equiv="refresh" content="0; url={portal_url}" />',
+            f'<meta http-equiv="refresh" content="0; url={escape(portal_url)}" />',
             unsafe_allow_html=True,
         )
 
-    points = total_points()
+    points = cached_total_points()
     streak = streak_days()
 
     icon_path = APP_ROOT / "icon.png"
@@ -1811,11 +2162,10 @@ def main() -> None:
         if icon_path.exists():
             st.image(str(icon_path), use_container_width=True)
     with top_right:
-        hero_line = random.choice([
-            "Hello, Young Innovator.",
-            "Online. Ready to explore.",
-            "Systems check: Curiosity at 100%.",
-        ])
+        # One line per session so the hero card does not change text on every rerun
+        hero_line = st.session_state.get("hero_line")
+        if hero_line is None:
+            hero_line = st.session_state["hero_line"] = _choice(HERO_LINES)
         st.markdown(
             f"""
 <div class="nc-card hero">
@@ -1834,12 +2184,12 @@ def main() -> None:
         )
 
     profile = st.session_state.get("supabase_profile")
-    api_key = st.secrets.get("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY"))
+    api_key = get_config("OPENAI_API_KEY", prefer_secrets=True)
     if not api_key:
         st.error("Add your OPENAI_API_KEY to .streamlit/secrets.toml or export it in the environment.")
         return
 
-    client = OpenAI(api_key=api_key)
+    client = get_openai_client(api_key)
 
     st.session_state.setdefault("active_tab", NAV_TABS[0])
     default_tab = st.session_state["active_tab"]
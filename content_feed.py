@@ -1,12 +1,16 @@
+from __future__ import annotations
+
 import os
 import re
 import uuid
 from datetime import datetime
 from functools import lru_cache
-from typing import Dict, List, Optional
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 
 import streamlit as st
-from supabase import Client, create_client
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 TABLE_NAME = "knowledge_feed"
 DEFAULT_FEED: List[Dict[str, str]] = []
@@ -24,6 +28,8 @@ def _get_supabase_client() -> Optional[Client]:
     )
     if not url or not key:
         return None
+    from supabase import create_client
+
     return create_client(url, key)
 
 
@@ -68,6 +74,25 @@ def load_feed() -> List[Dict[str, str]]:
     return feed
 
 
+def feed_version() -> Optional[Tuple[Optional[int], Optional[str]]]:
+    """Cheap change marker for the feed: (row count, newest created_at), or None if unavailable."""
+    client = _get_supabase_client()
+    if client is None:
+        return None
+    try:
+        response = (
+            client.table(TABLE_NAME)
+            .select("created_at", count="exact")
+            .order("created_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+    except Exception:
+        return None
+    rows = getattr(response, "data", []) or []
+    return (getattr(response, "count", None), rows[0].get("created_at") if rows else None)
+
+
 def add_feed_entry(
     title: str,
     summary: str,
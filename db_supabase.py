@@ -3,9 +3,20 @@
 from __future__ import annotations
 
 import datetime
-from typing import Any, Dict, List, Optional
+import re
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-from supabase import Client
+if TYPE_CHECKING:
+    from supabase import Client
+
+
+def _session_user_id(client: Client) -> str:
+    """User id from the locally held session; only falls back to the auth endpoint without one."""
+    session = client.auth.get_session()
+    if session and session.user:
+        return session.user.id
+    return client.auth.get_user().user.id
 
 
 # ============================================================================
@@ -122,19 +133,52 @@ def list_projects(client: Client, child_id: str, include_archived: bool = False)
     
     result = query.order("created_at", desc=True).execute()
     
-    # Map new schema fields to old field names for compatibility
-    projects = []
+    return [_project_from_row(row) for row in result.data]
+
+
+def list_projects_for_children(
+    client: Client, child_ids: List[str], include_archived: bool = False
+) -> Dict[str, List[Dict[str, Any]]]:
+    """List projects for several children in one query, grouped by child UUID."""
+    grouped: Dict[str, List[Dict[str, Any]]] = {child_id: [] for child_id in child_ids}
+    if not grouped:
+        return grouped
+    user_id = client.auth.get_user().user.id
+    query = (
+        client.table("coach_adventures")
+        .select("id, child_id, title, description, status, created_at")
+        .eq("user_id", user_id)
+        .in_("child_id", list(grouped))
+    )
+    
+    if not include_archived:
+        query = query.eq("status", "active")
+    
+    result = query.order("created_at", desc=True).execute()
+    
     for row in result.data:
-        project = {
-            "id": row["id"],
-            "name": row["title"],  # Map 'title' back to 'name'
-            "goal": row.get("description", ""),  # Map 'description' to 'goal'
-            "tags": "",  # Not in new schema
-            "archived": row["status"] != "active",
-            "system_prompt": "",  # Not in new schema
-        }
-        projects.append(project)
-    return projects
+        bucket = grouped.get(row.get("child_id"))
+        if bucket is not None:
+            bucket.append(_project_from_row(row))
+    return grouped
+
+
+def _split_tags(tags: Optional[str]) -> tuple:
+    return tuple(tag.strip() for tag in (tags or "").split(",") if tag.strip())
+
+
+def _project_from_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    # Map new schema fields to old field names for compatibility
+    tags = row.get("tags") or ""  # Not in new schema
+    return {
+        "id": row["id"],
+        "name": row["title"],  # Map 'title' back to 'name'
+        "goal": row.get("description", ""),  # Map 'description' to 'goal'
+        "tags": tags,
+        "tag_list": _split_tags(tags),  # Parsed once here so renders don't re-split
+        "archived": row["status"] != "active",
+        "system_prompt": "",  # Not in new schema
+    }
 
 
 def get_project(client: Client, project_id: str) -> Optional[Dict[str, Any]]:
@@ -142,15 +186,7 @@ def get_project(client: Client, project_id: str) -> Optional[Dict[str, Any]]:
     result = client.table("coach_adventures").select("*").eq("id", project_id).execute()
     
     if result.data:
-        row = result.data[0]
-        return {
-            "id": row["id"],
-            "name": row["title"],
-            "goal": row.get("description", ""),
-            "tags": "",
-            "archived": row["status"] != "active",
-            "system_prompt": "",
-        }
+        return _project_from_row(result.data[0])
     return None
 
 
@@ -235,7 +271,7 @@ def add_message(
     tokens_out: int = 0,
 ) -> str:
     """Add a message to a thread and return its UUID."""
-    user_id = client.auth.get_user().user.id
+    user_id = _session_user_id(client)
     # Store model and token counts in metadata
     metadata = {}
     if model:
@@ -275,26 +311,54 @@ def get_thread_messages(client: Client, thread_id: str) -> List[Dict[str, Any]]:
     return messages
 
 
+_OR_SPLIT = re.compile(r"(?:\s+OR)+\s+")
+
+
+def _search_terms(query: str) -> List[str]:
+    """Split a search box value like ``volcano OR kindness`` into its terms."""
+    return [term.strip() for term in _OR_SPLIT.split(query) if term.strip()]
+
+
+def _quote_filter_value(value: str) -> str:
+    # PostgREST needs reserved characters (commas, parentheses) quoted inside or=()
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
 def search_messages(client: Client, child_id: str, query: str) -> List[Dict[str, Any]]:
     """Search messages across all threads for a child."""
+    terms = _search_terms(query)
+    if not terms:
+        return []
     user_id = client.auth.get_user().user.id
-    # Simplified search - filter by user and search content
-    result = client.table("coach_messages").select(
+    
+    # Resolve this child's threads once instead of two lookups per matching message
+    adventures = client.table("coach_adventures").select("id").eq("user_id", user_id).eq("child_id", child_id).execute()
+    adventure_ids = [row["id"] for row in adventures.data]
+    if not adventure_ids:
+        return []
+    threads = client.table("coach_threads").select("id").eq("user_id", user_id).in_("adventure_id", adventure_ids).execute()
+    thread_ids = [row["id"] for row in threads.data]
+    if not thread_ids:
+        return []
+    
+    query_builder = client.table("coach_messages").select(
         "id, thread_id, content"
-    ).eq("user_id", user_id).ilike("content", f"%{query}%").limit(20).execute()
+    ).eq("user_id", user_id).in_("thread_id", thread_ids)
+    if len(terms) == 1:
+        query_builder = query_builder.ilike("content", f"%{terms[0]}%")
+    else:
+        query_builder = query_builder.or_(
+            ",".join(f"content.ilike.{_quote_filter_value(f'%{term}%')}" for term in terms)
+        )
+    result = query_builder.limit(20).execute()
     
-    # Filter to only messages from this child's threads
-    filtered = []
-    for msg in result.data:
-        thread = client.table("coach_threads").select("adventure_id").eq("id", msg["thread_id"]).execute()
-        if thread.data:
-            adventure = client.table("coach_adventures").select("child_id").eq("id", thread.data[0]["adventure_id"]).execute()
-            if adventure.data and adventure.data[0].get("child_id") == child_id:
-                filtered.append({
-                    "thread_id": msg["thread_id"],
-                    "snippet": msg["content"][:100] + "..." if len(msg["content"]) > 100 else msg["content"],
-                })
-    return filtered
+    return [
+        {
+            "thread_id": msg["thread_id"],
+            "snippet": msg["content"][:100] + "..." if len(msg["content"]) > 100 else msg["content"],
+        }
+        for msg in result.data
+    ]
 
 
 # ============================================================================
@@ -344,15 +408,22 @@ def recent_tag_counts(client: Client, days: int = 7) -> Dict[str, int]:
     """Get count of missions by tag in the last N days."""
     user_id = client.auth.get_user().user.id
     cutoff = datetime.date.today() - datetime.timedelta(days=days)
-    result = client.table("coach_missions_log").select("details, created_at").eq("user_id", user_id).gte("created_at", cutoff.isoformat()).execute()
+    # Pull only the category out of the jsonb column instead of whole rows
+    result = client.table("coach_missions_log").select("category:details->>category").eq("user_id", user_id).gte("created_at", cutoff.isoformat()).execute()
     
-    counts: Dict[str, int] = {}
-    for row in result.data:
-        details = row.get("details", {})
-        category = details.get("category", "")
-        if category:
-            counts[category] = counts.get(category, 0) + 1
-    return counts
+    return dict(Counter(row["category"] for row in result.data if row.get("category")))
+
+
+def weekly_dashboard(client: Client, days: int = 7) -> Tuple[Dict[str, int], int]:
+    """Get recent tag counts and the point total in one RPC call."""
+    try:
+        result = client.rpc("dashboard_weekly", {"d": days}).execute()
+    except Exception:
+        # Function not deployed yet: fall back to the two separate queries
+        return recent_tag_counts(client, days), total_points(client)
+    
+    data = result.data or {}
+    return dict(data.get("tags") or {}), int(data.get("total_points") or 0)
 
 
 # ============================================================================
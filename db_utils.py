@@ -5,7 +5,7 @@ allowing app.py to call database functions without passing the client explicitly
 """
 
 import streamlit as st
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
 import db_supabase
 
 # Simple in-memory fallback for family profiles/learning data to keep
@@ -42,6 +42,9 @@ def create_project(child_id: int, name: str, goal: str = "", tags: str = "", sys
 def list_projects(child_id: int, include_archived: bool = False) -> List[Dict[str, Any]]:
     return db_supabase.list_projects(_get_client(), child_id, include_archived)
 
+def list_projects_for_children(child_ids: List[int], include_archived: bool = False) -> Dict[int, List[Dict[str, Any]]]:
+    return db_supabase.list_projects_for_children(_get_client(), child_ids, include_archived)
+
 def get_project(project_id: int) -> Optional[Dict[str, Any]]:
     return db_supabase.get_project(_get_client(), project_id)
 
@@ -95,6 +98,9 @@ def log_mission(category: str, mission: str, child_id: Optional[int] = None) ->
 def recent_tag_counts(days: int = 7) -> Dict[str, int]:
     return db_supabase.recent_tag_counts(_get_client(), days)
 
+def weekly_dashboard(days: int = 7) -> Tuple[Dict[str, int], int]:
+    return db_supabase.weekly_dashboard(_get_client(), days)
+
 
 # Diary & Streak
 def mark_open_today(child_id: Optional[int] = None) -> None:
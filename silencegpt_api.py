@@ -1,6 +1,12 @@
-from typing import List, Dict, Optional
+from __future__ import annotations
 
-from openai import OpenAI
+from functools import lru_cache
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+
+if TYPE_CHECKING:
+    import httpx
+    from openai import OpenAI
 
 
 def _resolve_api_key(provided: Optional[str]) -> Optional[str]:
@@ -21,12 +27,32 @@ def _resolve_api_key(provided: Optional[str]) -> Optional[str]:
     return None
 
 
-def _build_client(api_key: Optional[str]) -> OpenAI:
-    resolved = _resolve_api_key(api_key)
-    if resolved:
-        return OpenAI(api_key=resolved)
+@lru_cache(maxsize=1)
+def _openai_http() -> httpx.Client:
+    """Shared connection pool for every OpenAI client in the process."""
+    import httpx
+
+    return httpx.Client(
+        # HTTP/2 needs the optional h2 package
+        http2=find_spec("h2") is not None,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+    )
+
+
+@lru_cache(maxsize=16)
+def get_openai_client(api_key: Optional[str] = None) -> OpenAI:
+    """Return a reusable OpenAI client for ``api_key`` backed by the shared pool."""
+    from openai import OpenAI
+
+    if api_key:
+        return OpenAI(api_key=api_key, http_client=_openai_http())
     # Fall back to default OpenAI resolution (env vars, config files)
-    return OpenAI()
+    return OpenAI(http_client=_openai_http())
+
+
+def _build_client(api_key: Optional[str]) -> OpenAI:
+    return get_openai_client(_resolve_api_key(api_key))
 
 
 def chat_completion(
@@ -46,3 +72,27 @@ def chat_completion(
         messages=messages,
     )
     return response.choices[0].message.content
+
+
+def chat_completion_stream(
+    messages: List[Dict[str, str]],
+    *,
+    api_key: Optional[str] = None,
+    model: str = "gpt-4.1-mini",
+    temperature: float = 0.7,
+    max_tokens: int = 700,
+) -> Iterator[str]:
+    """Like chat_completion, but yield the reply's text deltas as they arrive."""
+    client = _build_client(api_key)
+    stream = client.chat.completions.create(
+        model=model,
+        temperature=temperature,
+        max_tokens=max_tokens,
+        messages=messages,
+        stream=True,
+    )
+    for chunk in stream:
+        if chunk.choices:
+            delta = chunk.choices[0].delta.content
+            if delta:
+                yield delta
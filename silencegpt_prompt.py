@@ -1,6 +1,8 @@
+from functools import lru_cache
 from typing import Optional
 
 
+@lru_cache(maxsize=128)
 def build_system_prompt(
     child_name: str,
     age: Optional[int],
@@ -9,7 +11,7 @@ def build_system_prompt(
     project_goal: Optional[str],
     project_tags: Optional[str],
 ) -> str:
-    """Compose the SilenceGPT persona prompt for a specific child + project."""
+    """Compose the SilenceGPT persona prompt for a specific child + project (memoized; inputs are plain strings)."""
 
     safe_interests = interests or "curiosity across many topics"
     safe_dream = dream or "still discovering their dream"
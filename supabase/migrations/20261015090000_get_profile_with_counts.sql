@@ -0,0 +1,27 @@
+-- Return a user's profile together with the total profile count in one round trip
+create or replace function public.get_profile_with_counts(uid uuid)
+returns json
+language sql
+stable
+security definer
+set search_path = public
+as $$
+  select (
+    coalesce(
+      (
+        select to_jsonb(p)
+        from (
+          select subscription_status, trial_ends_at, stripe_customer_id, email,
+                 display_name, hero_dream, avatar_theme
+          from public.profiles
+          where id = uid
+        ) p
+      ),
+      '{}'::jsonb
+    )
+    || jsonb_build_object('total', (select count(*) from public.profiles))
+  )::json;
+$$;
+
+revoke all on function public.get_profile_with_counts(uuid) from public, anon, authenticated;
+grant execute on function public.get_profile_with_counts(uuid) to service_role;
@@ -0,0 +1,45 @@
+-- Precomputed profile count so the sidebar stat does not scan profiles on every read
+create extension if not exists pg_cron;
+
+create materialized view if not exists public.profiles_stats as
+select count(*)::bigint as total
+from public.profiles;
+
+revoke all on public.profiles_stats from public, anon, authenticated;
+grant select on public.profiles_stats to service_role;
+
+select cron.unschedule(jobid)
+from cron.job
+where jobname = 'refresh-profiles-stats';
+
+-- Plain refresh: the view is a single row, and a concurrent refresh would need a
+-- unique index on a plain column
+select cron.schedule(
+    'refresh-profiles-stats',
+    '*/5 * * * *',
+    $$refresh materialized view public.profiles_stats$$
+);
+
+create or replace function public.get_profile_with_counts(uid uuid)
+returns json
+language sql
+stable
+security definer
+set search_path = public
+as $$
+  select (
+    coalesce(
+      (
+        select to_jsonb(p)
+        from (
+          select subscription_status, trial_ends_at, stripe_customer_id, email,
+                 display_name, hero_dream, avatar_theme
+          from public.profiles
+          where id = uid
+        ) p
+      ),
+      '{}'::jsonb
+    )
+    || jsonb_build_object('total', (select total from public.profiles_stats limit 1))
+  )::json;
+$$;
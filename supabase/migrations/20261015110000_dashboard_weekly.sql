@@ -0,0 +1,23 @@
+-- Recent mission tag counts and the all-time point total for the signed-in user, in one call
+create or replace function public.dashboard_weekly(d integer default 7)
+returns json
+language sql
+stable
+security invoker
+set search_path = public
+as $$
+  with tags as (
+    select details->>'category' as category, count(*) as n
+    from public.coach_missions_log
+    where user_id = auth.uid()
+      and created_at >= current_date - d
+      and coalesce(details->>'category', '') <> ''
+    group by 1
+  )
+  select json_build_object(
+    'total_points', coalesce((select sum(points) from public.coach_points_log where user_id = auth.uid()), 0),
+    'tags', coalesce((select json_object_agg(category, n) from tags), '{}'::json)
+  );
+$$;
+
+grant execute on function public.dashboard_weekly(integer) to authenticated;
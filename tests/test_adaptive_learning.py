@@ -0,0 +1,147 @@
+import json
+
+import pytest
+
+from adaptive_learning import AdaptiveLearningEngine
+
+
+# Scoring
+
+def test_repeated_keyword_counts_once():
+    # "why" is both a low-comprehension and a curiosity keyword
+    assert AdaptiveLearningEngine._score_text("why why why?") == pytest.approx((0.3, 0.5, 0.36))
+
+
+def test_keyword_presence_ignores_punctuation_and_repeats():
+    assert AdaptiveLearningEngine._score_text("I understand, I understand") == pytest.approx((0.8, 0.3, 0.38))
+
+
+def test_phrases_match_across_words():
+    assert AdaptiveLearningEngine._score_text("That makes sense now.") == pytest.approx((0.8, 0.3, 0.38))
+    assert AdaptiveLearningEngine._score_text("Tell me more!") == pytest.approx((0.5, 0.5, 0.36))
+    # "understand" scores high and "don't understand" scores low
+    assert AdaptiveLearningEngine._score_text("I don't understand") == pytest.approx((0.6, 0.3, 0.36))
+
+
+def test_many_questions_lower_confidence_and_raise_curiosity():
+    assert AdaptiveLearningEngine._score_text("how? why? what?") == pytest.approx((0.1, 0.9, 0.288))
+
+
+def test_word_count_covers_non_latin_scripts():
+    hindi = " ".join(["तारे", "चमकते", "हैं"] * 15 + ["क्यों"])
+    assert len(hindi.split()) == 46
+    assert AdaptiveLearningEngine._score_text(hindi)[2] == 1.0
+
+
+def test_assess_comprehension_matches_batch_scoring():
+    engine = AdaptiveLearningEngine()
+    result = engine.assess_comprehension("why why why?", {}, now_iso="2026-01-01T00:00:00")
+    assert result["timestamp"] == "2026-01-01T00:00:00"
+    assert (result["comprehension_score"], result["curiosity_score"], result["confidence_score"]) == \
+        engine.score_responses(["why why why?"])[0]
+
+
+# Persistence
+
+def _entry(i):
+    return {"comprehension_score": 0.5, "curiosity_score": 0.5, "timestamp": f"t{i}"}
+
+
+def test_to_dict_from_dict_round_trip_trims_histories():
+    engine = AdaptiveLearningEngine()
+    engine.update_skill_level("Space", 2, 0.9)
+    engine.comprehension_history = [_entry(i) for i in range(60)]
+    engine.question_history = [_entry(i) for i in range(55)]
+
+    data = engine.to_dict()
+    assert len(data["comprehension_history"]) == AdaptiveLearningEngine.HISTORY_LIMIT
+    assert data["comprehension_history"][0]["timestamp"] == "t10"
+
+    restored = AdaptiveLearningEngine.from_dict(json.loads(json.dumps(data)))
+    assert restored.skill_matrix == engine.skill_matrix
+    assert restored.comprehension_history == data["comprehension_history"]
+    assert restored.question_history == data["question_history"]
+    assert isinstance(restored.comprehension_history, list)
+    assert restored.comprehension_history[-5:] == data["comprehension_history"][-5:]
+
+
+def test_get_state_load_state_round_trip():
+    engine = AdaptiveLearningEngine()
+    engine.update_skill_level("Robots", 3, 0.55)
+    restored = AdaptiveLearningEngine(engine.get_state())
+    assert restored.skill_matrix == {"Robots": [None, None, 0.55, None, None]}
+    assert restored.get_learning_insights("Ada")["avg_mastery"] == pytest.approx(0.55)
+
+
+def test_load_state_ignores_invalid_json():
+    engine = AdaptiveLearningEngine()
+    engine.load_state("{not json")
+    assert engine.skill_matrix == {}
+
+
+def test_legacy_dict_rows_are_normalized():
+    state = {"skill_matrix": {"Space": {"1": 0.9, "3": 0.5, "9": 1.0, "x": 0.1}}}
+    engine = AdaptiveLearningEngine(state)
+    assert engine.skill_matrix == {"Space": [0.9, None, 0.5, None, None]}
+    assert engine.get_learning_insights("Ada")["avg_mastery"] == pytest.approx(0.7)
+
+
+def test_null_skill_matrix_loads_empty():
+    engine = AdaptiveLearningEngine.from_dict({"skill_matrix": None, "comprehension_history": None})
+    assert engine.skill_matrix == {}
+    assert engine.comprehension_history == []
+    assert engine.get_learning_insights("Ada")["status"] == "beginning_journey"
+
+
+def test_assigning_skill_matrix_normalizes_and_rebuilds_aggregates():
+    engine = AdaptiveLearningEngine()
+    engine.update_skill_level("Space", 1, 0.9)
+    engine.skill_matrix = {"Robots": {2: 0.2, 4: 0.4}}
+    assert engine.skill_matrix == {"Robots": [None, 0.2, None, 0.4, None]}
+    insights = engine.get_learning_insights("Ada")
+    assert insights["topics_explored"] == 1
+    assert insights["avg_mastery"] == pytest.approx(0.3)
+    assert insights["growth_areas"][0]["level"] == 4
+
+
+# Aggregates
+
+def test_update_skill_level_keeps_aggregates_in_step():
+    engine = AdaptiveLearningEngine()
+    engine.update_skill_level("Space", 2, 0.9)
+    engine.update_skill_level("Space", 2, 0.5)
+    engine.update_skill_level("Space", 4, 0.8)
+    engine.update_skill_level("Math", 1, 0.2)
+
+    space = engine.skill_matrix["Space"]
+    assert space[1] == pytest.approx(0.3 * 0.5 + 0.7 * 0.9)
+    insights = engine.get_learning_insights("Ada")
+    assert insights["avg_mastery"] == pytest.approx(((space[1] + 0.8) / 2 + 0.2) / 2)
+    assert insights["strengths"][0]["topic"] == "Space"
+    assert insights["strengths"][0]["level"] == 4
+    assert insights["growth_areas"][0]["topic"] == "Math"
+
+    # Aggregates after incremental updates match a full rebuild
+    rebuilt = AdaptiveLearningEngine.from_dict(engine.to_dict())
+    assert rebuilt.get_learning_insights("Ada") == insights
+
+
+def test_get_optimal_difficulty():
+    engine = AdaptiveLearningEngine()
+    assert engine.get_optimal_difficulty("Space", 3) == AdaptiveLearningEngine.ELEMENTARY
+    engine.update_skill_level("Space", 3, 0.9)
+    engine.update_skill_level("Space", 2, 0.2)
+    engine.update_skill_level("Space", 4, 0.6)
+    assert engine.get_optimal_difficulty("Space", 3) == 4
+    assert engine.get_optimal_difficulty("Space", 2) == 1
+    assert engine.get_optimal_difficulty("Space", 4) == 4
+    assert engine.get_optimal_difficulty("Space", 5) == 5
+
+
+def test_get_optimal_difficulty_clamps_out_of_range_levels():
+    engine = AdaptiveLearningEngine()
+    engine.update_skill_level("Space", 7, 0.9)
+    engine.update_skill_level("Space", 0, 0.2)
+    assert engine.skill_matrix["Space"] == [0.2, None, None, None, 0.9]
+    assert engine.get_optimal_difficulty("Space", 7) == AdaptiveLearningEngine.EXPERT
+    assert engine.get_optimal_difficulty("Space", 0) == AdaptiveLearningEngine.BEGINNER
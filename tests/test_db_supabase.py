@@ -0,0 +1,23 @@
+from db_supabase import _quote_filter_value, _search_terms
+
+
+def test_search_terms_split_on_or():
+    assert _search_terms("volcano OR kindness") == ["volcano", "kindness"]
+    assert _search_terms("  black hole   OR  moon ") == ["black hole", "moon"]
+
+
+def test_search_terms_drop_empty_terms():
+    assert _search_terms("") == []
+    assert _search_terms("   ") == []
+    assert _search_terms("a OR  OR b") == ["a", "b"]
+
+
+def test_search_terms_only_split_on_uppercase_or():
+    assert _search_terms("rock or roll") == ["rock or roll"]
+    assert _search_terms("ORBIT") == ["ORBIT"]
+
+
+def test_quote_filter_value_escapes_reserved_characters():
+    assert _quote_filter_value("%a,b (c)%") == '"%a,b (c)%"'
+    assert _quote_filter_value('say "hi"') == '"say \\"hi\\""'
+    assert _quote_filter_value("back\\slash") == '"back\\\\slash"'
@@ -6,10 +6,12 @@ from __future__ import annotations
 
 import uuid
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-import snowflake.connector
 import streamlit as st
-from supabase import Client, create_client
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 
 @st.cache_resource(show_spinner=False)
@@ -19,6 +21,8 @@ def get_supabase_client() -> Client:
     key = supabase_cfg.get("service_role_key") or supabase_cfg.get("anon_key")
     if not url or not key:
         raise RuntimeError("Missing Supabase configuration in secrets.toml")
+    from supabase import create_client
+
     return create_client(url, key)
 
 
@@ -29,6 +33,9 @@ def get_snowflake_conn():
     missing = [field for field in required if field not in snow_cfg]
     if missing:
         raise RuntimeError(f"Missing Snowflake secrets: {', '.join(missing)}")
+    # The connector is slow to import and only needed once an article is saved
+    import snowflake.connector
+
     return snowflake.connector.connect(
         user=snow_cfg["user"],
         password=snow_cfg["password"],